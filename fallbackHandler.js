@@ -1,8 +1,33 @@
 const fs = require('fs');
 const path = require('path');
-const { createCanvas, loadImage } = require('canvas');
-const { v4: uuidv4 } = require('uuid');
-const { logActivity, logError } = require('./utils/logger');
+const { logActivity, logDebug, logError } = require('./utils/logger');
+const { downloadFile } = require('./utils/http');
+const { tempName } = require('./utils/files');
+
+/**
+ * Create a canvas, loading node-canvas on first use. It is a large native
+ * module that is only needed when a placeholder has to be drawn, so it is
+ * kept out of the bot's startup.
+ * @param {number} width - Canvas width
+ * @param {number} height - Canvas height
+ * @returns {Canvas} - New canvas
+ */
+function createCanvas(width, height) {
+  return require('canvas').createCanvas(width, height);
+}
+
+/**
+ * Encode a canvas as JPEG on libuv's thread pool. The callback form of
+ * toBuffer() runs the encoder off the main thread, unlike the synchronous one.
+ * @param {Canvas} canvas - Canvas to encode
+ * @param {number} quality - JPEG quality between 0 and 1
+ * @returns {Promise<Buffer>} - Encoded image
+ */
+function encodeJpeg(canvas, quality) {
+  return new Promise((resolve, reject) => {
+    canvas.toBuffer((err, buffer) => (err ? reject(err) : resolve(buffer)), 'image/jpeg', { quality });
+  });
+}
 
 /**
  * Class to handle fallback thumbnail generation when the main method fails
@@ -24,37 +49,35 @@ class FallbackHandler {
   }
   
   /**
-   * Extract Telegram's own thumbnail from video
+   * Download the thumbnail Telegram generated for a video
    * @param {Object} telegram - Telegram context object
-   * @param {string} fileId - File ID of the video
+   * @param {string} thumbnailFileId - File ID of the video's thumbnail
    * @returns {Promise<string>} - Path to the downloaded thumbnail
    */
-  async extractVideoThumbnail(telegram, fileId) {
+  async extractVideoThumbnail(telegram, thumbnailFileId) {
     try {
-      logActivity(`Trying to extract Telegram's thumbnail for file ${fileId}`);
-      
-      // Get file info
-      const file = await telegram.getFile(fileId);
-      
-      if (file && file.thumbnail) {
-        // Telegram generated a thumbnail
-        const thumbFileId = file.thumbnail.file_id;
-        const thumbFile = await telegram.getFile(thumbFileId);
-        
-        if (thumbFile && thumbFile.file_path) {
-          // Download the thumbnail
-          const outputPath = path.join(this.tempDir, `telegram_thumb_${uuidv4()}.jpg`);
-          const fileUrl = `https://api.telegram.org/file/bot${telegram.token}/${thumbFile.file_path}`;
-          
-          await this.downloadFile(fileUrl, outputPath);
-          logActivity(`Successfully extracted Telegram thumbnail: ${outputPath}`);
-          
-          return outputPath;
-        }
+      if (!thumbnailFileId) {
+        logActivity('No Telegram thumbnail found for the video');
+        return null;
       }
       
-      logActivity('No Telegram thumbnail found for the video');
-      return null;
+      logDebug(() => `Downloading Telegram's thumbnail ${thumbnailFileId}`);
+      
+      const thumbFile = await telegram.getFile(thumbnailFileId);
+      
+      if (!thumbFile || !thumbFile.file_path) {
+        logActivity('Could not get file info for the Telegram thumbnail');
+        return null;
+      }
+      
+      // Download the thumbnail
+      const outputPath = path.join(this.tempDir, `${tempName('telegram_thumb')}.jpg`);
+      const fileUrl = `https://api.telegram.org/file/bot${telegram.token}/${thumbFile.file_path}`;
+      
+      await downloadFile(fileUrl, outputPath);
+      logDebug(() => `Successfully extracted Telegram thumbnail: ${outputPath}`);
+      
+      return outputPath;
     } catch (error) {
       logError('Error extracting Telegram thumbnail:', error);
       return null;
@@ -72,7 +95,7 @@ class FallbackHandler {
       
       // Create a filename-safe version of the video name
       const safeVideoName = videoName.replace(/[^a-z0-9]/gi, '_').toLowerCase();
-      const outputPath = path.join(this.tempDir, `placeholder_${safeVideoName}_${uuidv4()}.jpg`);
+      const outputPath = path.join(this.tempDir, `${tempName(`placeholder_${safeVideoName}`)}.jpg`);
       
       // Create canvas (16:9 aspect ratio)
       const width = 1280;
@@ -113,8 +136,8 @@ class FallbackHandler {
       ctx.fillText(displayName, width / 2, height / 2 + 100);
       
       // Save to file
-      const buffer = canvas.toBuffer('image/jpeg', { quality: 0.9 });
-      fs.writeFileSync(outputPath, buffer);
+      const buffer = await encodeJpeg(canvas, 0.9);
+      await fs.promises.writeFile(outputPath, buffer);
       
       logActivity(`Generated placeholder thumbnail: ${outputPath}`);
       return outputPath;
@@ -132,7 +155,7 @@ class FallbackHandler {
     try {
       logActivity('Generating simple placeholder as last resort');
       
-      const outputPath = path.join(this.tempDir, `simple_placeholder_${uuidv4()}.jpg`);
+      const outputPath = path.join(this.tempDir, `${tempName('simple_placeholder')}.jpg`);
       
       // Create a simple canvas
       const width = 640;
@@ -155,8 +178,8 @@ class FallbackHandler {
       ctx.fillText('Video Preview', width / 2, height / 2);
       
       // Save to file
-      const buffer = canvas.toBuffer('image/jpeg', { quality: 0.8 });
-      fs.writeFileSync(outputPath, buffer);
+      const buffer = await encodeJpeg(canvas, 0.8);
+      await fs.promises.writeFile(outputPath, buffer);
       
       logActivity(`Generated simple placeholder: ${outputPath}`);
       return outputPath;
@@ -165,31 +188,6 @@ class FallbackHandler {
       return null;
     }
   }
-  
-  /**
-   * Download a file from URL
-   * @param {string} url - URL to download
-   * @param {string} outputPath - Where to save the file
-   * @returns {Promise<void>}
-   */
-  async downloadFile(url, outputPath) {
-    return new Promise((resolve, reject) => {
-      const https = require('https');
-      const file = fs.createWriteStream(outputPath);
-      
-      https.get(url, (response) => {
-        response.pipe(file);
-        
-        file.on('finish', () => {
-          file.close();
-          resolve();
-        });
-      }).on('error', (err) => {
-        fs.unlink(outputPath, () => {}); // Delete the file on error
-        reject(err);
-      });
-    });
-  }
 }
 
 module.exports = FallbackHandler;
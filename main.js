@@ -1,4 +1,4 @@
-const { Telegraf, Markup } = require('telegraf');
+const { Telegraf, Markup, Scenes, Composer, session } = require('telegraf');
 const fs = require('fs');
 const path = require('path');
 const os = require('os');
@@ -11,7 +11,12 @@ const rateLimit = require('telegraf-ratelimit');
 const ThumbnailGenerator = require('./thumbnailGenerator');
 const FallbackHandler = require('./fallbackHandler');
 const { UserState } = require('./models/userState');
-const { logActivity, logError } = require('./utils/logger');
+const { logActivity, logDebug, logError } = require('./utils/logger');
+const { TtlCache } = require('./utils/cache');
+const { fileExists, removeFile, removeFiles, linkOrCopy } = require('./utils/files');
+const { TokenBucket } = require('./utils/rateLimiter');
+const { KeyedLock } = require('./utils/keyedLock');
+const { httpsAgent } = require('./utils/http');
 
 // Add Post model import
 const { Post } = require('./models/post');
@@ -36,19 +41,36 @@ const CHANNELS = {
   MOVIE: '@diskmoviee'
 };
 
+// Channel IDs by name, for callback dispatch
+const CHANNEL_MAP = new Map(Object.entries(CHANNELS));
+
+// Channel names by ID, for labelling stored posts
+const CHANNEL_NAMES = new Map(Object.entries(CHANNELS).map(([name, id]) => [id, name]));
+
+// Channel selection keyboard, built once since it never changes
+const CHANNEL_KEYBOARD = Markup.inlineKeyboard([
+  Object.keys(CHANNELS).map((name) => Markup.button.callback(name, `channel_${name}`))
+]);
+
+// Button linking to the request bot, shown under every channel post
+const REQUEST_VIDEO_BUTTON = Markup.button.url('Request Video', 'https://t.me/teraseeubot');
+
 // List of admin user IDs who can use the bot
-const ADMIN_IDS = [
+const ADMIN_IDS = new Set([
   1352497419,
   // Add additional admin IDs here
-];
+]);
 
 // Debug token length without revealing contents
 console.log(`Token configuration verified (length: ${BOT_TOKEN.length})`);
 
 // Initialize the bot
-const bot = new Telegraf(BOT_TOKEN);
+const bot = new Telegraf(BOT_TOKEN, { telegram: { agent: httpsAgent } });
 const tempDir = path.join(os.tmpdir(), 'telegram-thumbnails');
 
+// Thumbnails kept for resending published posts
+const postThumbnailDir = path.join(tempDir, 'posts');
+
 // Initialize our modules
 const thumbnailGenerator = new ThumbnailGenerator(tempDir);
 const fallbackHandler = new FallbackHandler(tempDir);
@@ -56,12 +78,60 @@ const fallbackHandler = new FallbackHandler(tempDir);
 // Maximum accepted video size (1GB)
 const MAX_VIDEO_SIZE = 1024 * 1024 * 1024;
 
+// Containers ffmpeg can reliably take thumbnails from
+const SUPPORTED_VIDEO_TYPES = ['video/mp4', 'video/webm', 'video/quicktime', 'video/x-matroska'];
+
 // Number of posts per page for listing
 const POSTS_PER_PAGE = 5;
 
-// Create temp directory if it doesn't exist
-if (!fs.existsSync(tempDir)) {
-  fs.mkdirSync(tempDir, { recursive: true });
+// Formatters for post timestamps, created once. toLocaleDateString() and
+// toLocaleTimeString() build a new formatter on every call; these use the
+// same defaults so the output is unchanged.
+const POST_DATE_FORMAT = new Intl.DateTimeFormat();
+const POST_TIME_FORMAT = new Intl.DateTimeFormat(undefined, { hour: 'numeric', minute: 'numeric', second: 'numeric' });
+
+// Telegram file info keyed by file_id. File paths stay valid for about an
+// hour, so entries expire a little before that (50 minutes).
+const fileInfoCache = new TtlCache({ max: 1000, ttl: 50 * 60 * 1000 });
+
+// Telegraf sessions (scene progress), bounded and expired after 30 minutes of
+// inactivity. Abandoned post flows get their temp files cleaned up. Expiry
+// can be noticed while the user's next update is being handled, so only the
+// flow the session belonged to is cleaned, never one that has replaced it.
+const sessionStore = new TtlCache({
+  max: 10000,
+  ttl: 30 * 60 * 1000,
+  dispose: (sessionData, key) => {
+    const scenes = sessionData.__scenes;
+    
+    if (scenes && scenes.current === 'post' && scenes.state && scenes.state.sessionId) {
+      const userId = parseInt(key.split(':')[0]);
+      
+      cleanupTempFiles(userId, scenes.state.sessionId).catch((error) => {
+        logError('Error cleaning up expired session:', error);
+      });
+    }
+  }
+});
+
+// Outgoing channel messages, kept under Telegram's limit of 30 per second
+const broadcastLimiter = new TokenBucket({ capacity: 30, interval: 1000 });
+
+// Resends currently being sent, keyed 'resend:<postId>:<channel>'. A user's
+// own taps are already serialized by userLocks below; this stops two admins
+// resending the same post to the same channel at once.
+const postsInFlight = new Set();
+
+// Updates from the same user are handled one at a time, so two taps or
+// messages fetched in the same batch can't race on the session or UserState
+const userLocks = new KeyedLock();
+
+// Sweep expired sessions so idle users are cleaned up without a new message
+setInterval(() => sessionStore.prune(), 5 * 60 * 1000).unref();
+
+// Create temp directories if they don't exist
+if (!fs.existsSync(postThumbnailDir)) {
+  fs.mkdirSync(postThumbnailDir, { recursive: true });
 }
 
 // Connect to MongoDB
@@ -88,17 +158,80 @@ bot.use(rateLimit(limitConfig));
 const adminCheckMiddleware = async (ctx, next) => {
   const userId = ctx.from.id;
   
-  // Log all attempted access
-  logActivity(`Access attempt by user ${userId} (${ctx.from.username || 'no username'})`);
-  
-  if (ADMIN_IDS.includes(userId)) {
+  // Admins pass straight through; only rejected attempts are logged
+  if (ADMIN_IDS.has(userId)) {
     return next();
-  } else {
-    logActivity(`Unauthorized access attempt by user ${userId}`);
-    return ctx.reply('Sorry, this bot is only available to administrators.');
   }
+  
+  logActivity(`Unauthorized access attempt by user ${userId} (${ctx.from.username || 'no username'})`);
+  return ctx.reply('Sorry, this bot is only available to administrators.');
 };
 
+// Conversation flow for creating a post. Each step only handles the update
+// it expects; anything else (commands, new videos, other callbacks) falls
+// through to the global handlers below.
+const postScene = new Scenes.WizardScene(
+  'post',
+  handleVideoStep,
+  Composer.compose([
+    Composer.on('photo', handleManualThumbnailStep),
+    Composer.on('text', handleThumbnailSelectionStep)
+  ]),
+  Composer.on('text', handleUrlStep),
+  Composer.on('text', handleCaptionStep),
+  Composer.action(/^channel_/, handleChannelStep)
+);
+
+// Wizard step indexes that are jumped to directly
+const POST_STEP_SELECT_THUMBNAIL = 1;
+const POST_STEP_URL = 2;
+const POST_STEP_CAPTION = 3;
+const POST_STEP_CHANNEL = 4;
+
+// Waits for the message to broadcast to all channels
+const broadcastScene = new Scenes.BaseScene('broadcast');
+broadcastScene.on('text', handleBroadcastMessage);
+
+const stage = new Scenes.Stage([postScene, broadcastScene]);
+
+bot.use((ctx, next) => (ctx.from ? userLocks.run(ctx.from.id, next) : next()));
+bot.use(session({ store: sessionStore }));
+bot.use(restorePostScene);
+bot.use(stage.middleware());
+
+// Sessions only live in memory, so after a restart an admin's post flow is
+// put back on the step its UserState has reached instead of being dropped
+async function restorePostScene(ctx, next) {
+  const scenes = ctx.session && ctx.session.__scenes;
+  
+  if (!ctx.session || (scenes && scenes.current) || !ADMIN_IDS.has(ctx.from.id)) {
+    return next();
+  }
+  
+  try {
+    const userState = await UserState.findOne({ userId: ctx.from.id }).lean();
+    const step = userState && postStepFromState(userState);
+    
+    if (step !== null && step !== undefined) {
+      ctx.session.__scenes = { current: 'post', cursor: step, state: { sessionId: userState.sessionId } };
+      logActivity(`Restored post flow for user ${ctx.from.id} at step ${step}`);
+    }
+  } catch (error) {
+    logError('Error restoring post flow:', error);
+  }
+  
+  return next();
+}
+
+// Wizard step a stored post flow is waiting on, or null if there is none
+function postStepFromState(userState) {
+  if (!userState.videoId) return null;
+  if (!userState.selectedThumbnail) return POST_STEP_SELECT_THUMBNAIL;
+  if (!userState.url) return POST_STEP_URL;
+  if (!userState.caption) return POST_STEP_CAPTION;
+  return POST_STEP_CHANNEL;
+}
+
 // Basic commands
 bot.start((ctx) => {
   try {
@@ -134,16 +267,7 @@ bot.help((ctx) => {
 // Admin commands
 bot.command('broadcast', adminCheckMiddleware, async (ctx) => {
   try {
-    // Store state in database
-    await UserState.findOneAndUpdate(
-      { userId: ctx.from.id },
-      { 
-        userId: ctx.from.id,
-        waitingForBroadcastMessage: true,
-        lastUpdated: new Date()
-      },
-      { upsert: true, new: true }
-    );
+    await ctx.scene.enter('broadcast');
     
     ctx.reply('Please send the message you want to broadcast to all channels.');
   } catch (error) {
@@ -183,20 +307,22 @@ bot.command('posts', adminCheckMiddleware, async (ctx) => {
     // Calculate skip value for pagination
     const skip = (page - 1) * POSTS_PER_PAGE;
     
-    // Get total count for pagination
-    const totalPosts = await Post.countDocuments();
+    // Get total count for pagination and the page of posts (newest first)
+    // together; only the fields shown in the list are fetched, as plain objects
+    const [totalPosts, posts] = await Promise.all([
+      Post.countDocuments(),
+      Post.find({}, 'postId caption channelId createdAt')
+        .sort({ createdAt: -1 })
+        .skip(skip)
+        .limit(POSTS_PER_PAGE)
+        .lean()
+    ]);
     const totalPages = Math.ceil(totalPosts / POSTS_PER_PAGE);
     
     if (totalPosts === 0) {
       return ctx.reply('No posts found in the database.');
     }
     
-    // Fetch posts with pagination, sorted by newest first
-    const posts = await Post.find()
-      .sort({ createdAt: -1 })
-      .skip(skip)
-      .limit(POSTS_PER_PAGE);
-    
     if (posts.length === 0) {
       return ctx.reply(`No posts found on page ${page}. Total pages: ${totalPages}`);
     }
@@ -205,12 +331,13 @@ bot.command('posts', adminCheckMiddleware, async (ctx) => {
     let message = `Posts (Page ${page}/${totalPages}):\n\n`;
     
     posts.forEach((post, index) => {
-      const date = post.createdAt.toLocaleDateString();
-      const time = post.createdAt.toLocaleTimeString();
-      const channel = Object.keys(CHANNELS).find(key => CHANNELS[key] === post.channelId) || post.channelId;
+      const date = POST_DATE_FORMAT.format(post.createdAt);
+      const time = POST_TIME_FORMAT.format(post.createdAt);
+      const channel = CHANNEL_NAMES.get(post.channelId) || post.channelId;
+      const caption = post.caption || '';
       
       message += `${index + 1 + skip}. Post ID: ${post.postId}\n`;
-      message += `📝 Caption: ${post.caption.substring(0, 30)}${post.caption.length > 30 ? '...' : ''}\n`;
+      message += `📝 Caption: ${caption.substring(0, 30)}${caption.length > 30 ? '...' : ''}\n`;
       message += `📺 Channel: ${channel}\n`;
       message += `🕒 Posted: ${date} ${time}\n\n`;
     });
@@ -233,27 +360,29 @@ bot.command('recent', adminCheckMiddleware, async (ctx) => {
     const channelName = args[1]?.toUpperCase();
     const page = parseInt(args[2]) || 1;
     
-    if (!channelName || !CHANNELS[channelName]) {
+    if (!channelName || !CHANNEL_MAP.has(channelName)) {
       return ctx.reply(`Please specify a valid channel name: /recent [STUFF|MOVIE] [page]`);
     }
     
-    const channelId = CHANNELS[channelName];
+    const channelId = CHANNEL_MAP.get(channelName);
     const skip = (page - 1) * POSTS_PER_PAGE;
     
-    // Get total count for this channel
-    const totalPosts = await Post.countDocuments({ channelId });
+    // Get total count for this channel and the page of posts together; only
+    // the fields shown in the list are fetched, as plain objects
+    const [totalPosts, posts] = await Promise.all([
+      Post.countDocuments({ channelId }),
+      Post.find({ channelId }, 'postId caption url createdAt')
+        .sort({ createdAt: -1 })
+        .skip(skip)
+        .limit(POSTS_PER_PAGE)
+        .lean()
+    ]);
     const totalPages = Math.ceil(totalPosts / POSTS_PER_PAGE);
     
     if (totalPosts === 0) {
       return ctx.reply(`No posts found for channel ${channelName}.`);
     }
     
-    // Fetch posts for this channel
-    const posts = await Post.find({ channelId })
-      .sort({ createdAt: -1 })
-      .skip(skip)
-      .limit(POSTS_PER_PAGE);
-    
     if (posts.length === 0) {
       return ctx.reply(`No posts found on page ${page} for channel ${channelName}. Total pages: ${totalPages}`);
     }
@@ -262,8 +391,8 @@ bot.command('recent', adminCheckMiddleware, async (ctx) => {
     let message = `Recent posts for ${channelName} (Page ${page}/${totalPages}):\n\n`;
     
     posts.forEach((post, index) => {
-      const date = post.createdAt.toLocaleDateString();
-      const time = post.createdAt.toLocaleTimeString();
+      const date = POST_DATE_FORMAT.format(post.createdAt);
+      const time = POST_TIME_FORMAT.format(post.createdAt);
       
       message += `${index + 1 + skip}. Post ID: ${post.postId}\n`;
       message += `📝 Caption: ${post.caption.substring(0, 30)}${post.caption.length > 30 ? '...' : ''}\n`;
@@ -303,7 +432,7 @@ bot.command('resend', adminCheckMiddleware, async (ctx) => {
     let message = `Post found! Details:\n\n`;
     message += `Caption: ${post.caption}\n`;
     message += `URL: ${post.url}\n`;
-    message += `Original channel: ${Object.keys(CHANNELS).find(key => CHANNELS[key] === post.channelId) || post.channelId}\n\n`;
+    message += `Original channel: ${CHANNEL_NAMES.get(post.channelId) || post.channelId}\n\n`;
     message += `Select destination channel for repost:`;
     
     // Create keyboard with channel options
@@ -325,6 +454,13 @@ bot.command('resend', adminCheckMiddleware, async (ctx) => {
 bot.action(/resend_(.+)_(.+)/, adminCheckMiddleware, async (ctx) => {
   const postId = ctx.match[1];
   const channelName = ctx.match[2]; // STUFF or MOVIE
+  const inFlightKey = `resend:${postId}:${channelName}`;
+  
+  if (postsInFlight.has(inFlightKey)) {
+    return ctx.answerCbQuery('This post is already being resent.');
+  }
+  
+  postsInFlight.add(inFlightKey);
   
   try {
     await ctx.answerCbQuery(`Preparing to resend to ${channelName} channel...`);
@@ -336,59 +472,40 @@ bot.action(/resend_(.+)_(.+)/, adminCheckMiddleware, async (ctx) => {
       return ctx.reply(`Post with ID ${postId} not found.`);
     }
     
-    const channelId = CHANNELS[channelName];
+    const channelId = CHANNEL_MAP.get(channelName);
     
-    // Create inline keyboard with URL button and Request Video button
-    const inlineKeyboard = Markup.inlineKeyboard([
-      [Markup.button.url('Link mawas', post.url)],
-      [Markup.button.url('Request Video', 'https://t.me/teraseeubot')]
-    ]);
+    const inlineKeyboard = buildPostKeyboard(post.url);
     
     ctx.reply(`Resending post to ${channelName} channel...`);
     
-    // Check if we have the thumbnail file
-    const thumbnailExists = post.thumbnailPath && fs.existsSync(post.thumbnailPath);
+    const photoExtra = {
+      caption: post.caption,
+      reply_markup: inlineKeyboard.reply_markup
+    };
     let result;
     
-    if (thumbnailExists) {
+    // The photo is already on Telegram, so resending it by file_id needs no
+    // upload; the local file is only a fallback
+    if (post.thumbnailFileId) {
+      try {
+        result = await ctx.telegram.sendPhoto(channelId, post.thumbnailFileId, photoExtra);
+      } catch (thumbnailError) {
+        logError('Error resending with thumbnail file ID:', thumbnailError);
+      }
+    }
+    
+    if (!result && post.thumbnailPath && await fileExists(post.thumbnailPath)) {
       // Resend with original thumbnail
-      result = await ctx.telegram.sendPhoto(
+      result = await ctx.telegram.sendPhoto(channelId, { source: post.thumbnailPath }, photoExtra);
+    }
+    
+    if (!result) {
+      // No thumbnail available, send as text
+      result = await ctx.telegram.sendMessage(
         channelId,
-        { source: post.thumbnailPath },
-        { 
-          caption: post.caption,
-          reply_markup: inlineKeyboard.reply_markup
-        }
+        `${post.caption}\n\nOriginal post resent by admin.`,
+        { reply_markup: inlineKeyboard.reply_markup }
       );
-    } else {
-      // If original thumbnail is unavailable, let's try to fetch from Telegram
-      if (post.thumbnailFileId) {
-        try {
-          result = await ctx.telegram.sendPhoto(
-            channelId,
-            post.thumbnailFileId,
-            { 
-              caption: post.caption,
-              reply_markup: inlineKeyboard.reply_markup
-            }
-          );
-        } catch (thumbnailError) {
-          logError('Error resending with thumbnail file ID:', thumbnailError);
-          // If that also fails, send as text
-          result = await ctx.telegram.sendMessage(
-            channelId,
-            `${post.caption}\n\nOriginal post resent by admin.`,
-            { reply_markup: inlineKeyboard.reply_markup }
-          );
-        }
-      } else {
-        // No thumbnail info available, send as text
-        result = await ctx.telegram.sendMessage(
-          channelId,
-          `${post.caption}\n\nOriginal post resent by admin.`,
-          { reply_markup: inlineKeyboard.reply_markup }
-        );
-      }
     }
     
     logActivity(`Resent post ${postId} to ${channelId}`);
@@ -401,7 +518,8 @@ bot.action(/resend_(.+)_(.+)/, adminCheckMiddleware, async (ctx) => {
       url: post.url,
       channelId: channelId,
       channelName: channelName,
-      thumbnailFileId: result.photo ? result.photo[0].file_id : null,
+      thumbnailFileId: result.photo ? largestPhoto(result.photo).file_id : null,
+      thumbnailPath: post.thumbnailPath,
       messageId: result.message_id,
       isResend: true,
       originalPostId: postId,
@@ -414,24 +532,57 @@ bot.action(/resend_(.+)_(.+)/, adminCheckMiddleware, async (ctx) => {
   } catch (error) {
     logError('Error resending post:', error);
     ctx.reply('Sorry, there was an error resending the post. Please make sure the bot is an admin in the channel with posting permissions.');
+  } finally {
+    postsInFlight.delete(inFlightKey);
   }
 });
 
-// Handle incoming videos
-bot.on('video', adminCheckMiddleware, async (ctx) => {
+// Handle incoming videos by starting the post flow
+bot.on('video', adminCheckMiddleware, (ctx) => {
+  // Reject videos that can't be processed before any download or ffmpeg work
+  const rejection = getVideoRejection(ctx.message.video);
+  
+  if (rejection) {
+    return ctx.reply(rejection);
+  }
+  
+  return ctx.scene.enter('post');
+});
+
+// Check a video against the processing limits
+// Returns a message for the user if it can't be processed, or null if it can
+function getVideoRejection(video) {
+  if (video.file_size > MAX_VIDEO_SIZE) {
+    return 'Sorry, the video is too large. Maximum allowed size is 1GB.';
+  }
+  
+  if (video.mime_type && !SUPPORTED_VIDEO_TYPES.includes(video.mime_type)) {
+    return 'Sorry, this video format is not supported. Please send an MP4, WebM, MOV or MKV video.';
+  }
+  
+  if (!(video.duration >= 1)) {
+    return 'Sorry, the video is too short. It must be at least 1 second long.';
+  }
+  
+  if (!(video.width > 0 && video.height > 0)) {
+    return 'Sorry, I couldn\'t read the size of this video. Please try a different file.';
+  }
+  
+  return null;
+}
+
+// Post flow: store the video and generate thumbnails
+async function handleVideoStep(ctx) {
   try {
     const video = ctx.message.video;
     const userId = ctx.from.id;
     
-    // Check file size
-    if (video.file_size > MAX_VIDEO_SIZE) {
-      return ctx.reply('Sorry, the video is too large. Maximum allowed size is 1GB.');
-    }
-
     await ctx.reply('Processing your video. This may take a moment...');
 
-    // Generate a unique session ID for this processing session
+    // Generate a unique session ID for this processing session. It is also
+    // kept in the scene state so an expired session can be matched to it.
     const sessionId = uuidv4();
+    ctx.wizard.state.sessionId = sessionId;
     
     // Store video information in database
     await UserState.findOneAndUpdate(
@@ -440,7 +591,10 @@ bot.on('video', adminCheckMiddleware, async (ctx) => {
         userId,
         sessionId,
         videoId: video.file_id,
+        videoUniqueId: video.file_unique_id,
         videoName: video.file_name || 'video.mp4',
+        mimeType: video.mime_type,
+        videoThumbnailId: (video.thumbnail || video.thumb)?.file_id,
         videoWidth: video.width,
         videoHeight: video.height,
         aspectRatio: (video.width / video.height).toFixed(2),
@@ -451,15 +605,19 @@ bot.on('video', adminCheckMiddleware, async (ctx) => {
     );
     
     // Process the video
-    await processVideoForThumbnails(ctx, userId);
+    const thumbnailCount = await processVideoForThumbnails(ctx, userId);
+    
+    // With a single thumbnail there is nothing to choose, so go straight to the URL
+    ctx.wizard.selectStep(thumbnailCount === 1 ? POST_STEP_URL : POST_STEP_SELECT_THUMBNAIL);
   } catch (error) {
     logError('Error handling video:', error);
     ctx.reply('Sorry, there was an error processing your video. Please try again or upload a different video.');
     
     // Clean up
     await cleanupTempFiles(ctx.from.id);
+    return ctx.scene.leave();
   }
-});
+}
 
 // Process videos with improved error handling
 async function processVideoForThumbnails(ctx, userId) {
@@ -472,90 +630,205 @@ async function processVideoForThumbnails(ctx, userId) {
       throw new Error('User state not found');
     }
     
-    await ctx.reply('Analyzing video and preparing thumbnail extraction...');
-    
-    // Get file info from Telegram
-    const fileInfo = await ctx.telegram.getFile(userState.videoId);
-    const fileUrl = `https://api.telegram.org/file/bot${BOT_TOKEN}/${fileInfo.file_path}`;
+    // Telegram usually ships its own thumbnail with the video; it costs a
+    // tiny download and no decoding, so offer it as the first option. It is
+    // fetched on its own: getFile refuses videos over 20MB, but never the
+    // thumbnail, which is downloaded while the other thumbnails are generated.
+    const telegramThumbnailTask = fallbackHandler.extractVideoThumbnail(ctx.telegram, userState.videoThumbnailId);
+    let generated = { thumbnails: [], timestamps: [] };
+    
+    try {
+      // Get file info from Telegram while the status message is being sent
+      const [, fileInfo] = await Promise.all([
+        ctx.reply('Analyzing video and preparing thumbnail extraction...'),
+        getFileInfo(ctx.telegram, userState.videoId)
+      ]);
+      const fileUrl = `https://api.telegram.org/file/bot${BOT_TOKEN}/${fileInfo.file_path}`;
+      
+      // Video info for thumbnail generation
+      const videoInfo = {
+        duration: userState.duration,
+        width: userState.videoWidth,
+        height: userState.videoHeight,
+        file_name: userState.videoName,
+        file_size: fileInfo.file_size,
+        file_unique_id: userState.videoUniqueId,
+        mime_type: userState.mimeType
+      };
+      
+      generated = await thumbnailGenerator.generateThumbnails(fileUrl, videoInfo);
+    } catch (error) {
+      logError('Could not generate thumbnails from the video:', error);
+    }
     
-    // Video info for thumbnail generation
-    const videoInfo = {
-      duration: userState.duration,
-      width: userState.videoWidth,
-      height: userState.videoHeight,
-      file_name: userState.videoName,
-      file_size: fileInfo.file_size
-    };
+    const telegramThumbnail = await telegramThumbnailTask;
+    let thumbnails = generated.thumbnails;
+    let timestamps = generated.timestamps;
     
-    // Try to generate thumbnails
-    let thumbnails = await thumbnailGenerator.generateThumbnails(fileUrl, videoInfo);
+    if (telegramThumbnail) {
+      thumbnails = [telegramThumbnail, ...thumbnails];
+      timestamps = [null, ...timestamps];
+    }
     
     // If thumbnails generation failed completely, try fallbacks
-    if (!thumbnails || thumbnails.length === 0) {
+    if (thumbnails.length === 0) {
       logActivity('Main thumbnail generation failed, trying fallbacks');
       
-      // Try to extract Telegram's own thumbnail first
-      const telegramThumbnail = await fallbackHandler.extractVideoThumbnail(ctx.telegram, userState.videoId);
+      // Try creating a placeholder as final resort
+      const placeholderThumbnail = await fallbackHandler.generatePlaceholderThumbnail(userState.videoName);
       
-      if (telegramThumbnail) {
-        thumbnails = [telegramThumbnail];
-      } else {
-        // Try creating a placeholder as final resort
-        const placeholderThumbnail = await fallbackHandler.generatePlaceholderThumbnail(userState.videoName);
-        
-        if (placeholderThumbnail) {
-          thumbnails = [placeholderThumbnail];
-        }
+      if (placeholderThumbnail) {
+        thumbnails = [placeholderThumbnail];
+        timestamps = [null];
       }
     }
     
     if (thumbnails && thumbnails.length > 0) {
       // Store thumbnails paths in database
       userState.thumbnails = thumbnails;
-      userState.waitingForThumbnailSelection = thumbnails.length > 1;
-      
-      await userState.save();
+      userState.timestamps = timestamps;
       
       // If only one thumbnail, skip selection
       if (thumbnails.length === 1) {
-        userState.selectedThumbnail = thumbnails[0];
-        userState.waitingForThumbnailSelection = false;
-        userState.waitingForUrl = true;
+        const selected = await getFullSizeThumbnail(ctx, userState, 0);
         
-        await userState.save();
+        if (!selected) {
+          await userState.save();
+          await ctx.reply('I couldn\'t extract the thumbnail at full size. Reply 1 to try again, or upload an image to use instead.');
+          return 0;
+        }
         
-        await ctx.replyWithPhoto(
-          { source: thumbnails[0] },
+        userState.selectedThumbnail = selected;
+        
+        const sent = await ctx.replyWithPhoto(
+          { source: userState.selectedThumbnail },
           { caption: 'Only one thumbnail could be generated. I\'ll use this one!' }
         );
         
+        // The photo is on Telegram now, so the channel post can reuse it
+        userState.selectedThumbnailFileId = largestPhoto(sent.photo).file_id;
+        await userState.save();
+        
         // Ask for URL
         ctx.reply('Now please send me the URL to include with this post:');
       } else {
-        // Multiple thumbnails, ask for selection
-        await ctx.reply('Choose one of these thumbnails by replying with the number (1-' + thumbnails.length + '):');
+        await userState.save();
+        
+        // Multiple thumbnails: send them as one contact sheet so the user
+        // waits for a single upload instead of one per thumbnail
+        const sheet = await thumbnailGenerator.createContactSheet(thumbnails);
         
-        // Send thumbnails
-        for (let i = 0; i < thumbnails.length; i++) {
+        if (sheet) {
           await ctx.replyWithPhoto(
-            { source: thumbnails[i] }, 
-            { caption: `Thumbnail ${i + 1}` }
+            { source: sheet },
+            { caption: `Thumbnails 1-${thumbnails.length}, left to right. Reply with the number of the one you want.` }
           );
+        } else {
+          await ctx.reply('Choose one of these thumbnails by replying with the number (1-' + thumbnails.length + '):');
+          
+          // Send thumbnails as a single album (at most 10 photos per request)
+          await ctx.replyWithMediaGroup(thumbnails.map((thumbnail, i) => ({
+            type: 'photo',
+            media: { source: thumbnail },
+            caption: `Thumbnail ${i + 1}`
+          })));
         }
       }
-    } else {
-      // All generation methods failed, ask for manual upload
-      await handleThumbnailGenerationError(ctx, userId);
+      
+      return thumbnails.length;
     }
+    
+    // All generation methods failed, ask for manual upload
+    await handleThumbnailGenerationError(ctx);
+    return 0;
   } catch (error) {
     logError('Error processing video for thumbnails:', error);
     // Ask user for manual thumbnail upload
-    await handleThumbnailGenerationError(ctx, userId);
+    await handleThumbnailGenerationError(ctx);
+    return 0;
+  }
+}
+
+// Thumbnails are offered as small previews; extract the chosen one again at
+// full size. Thumbnails with no video position (Telegram's own, placeholders)
+// are used as they are. Returns null if extraction fails, since the preview
+// is too small to post.
+async function getFullSizeThumbnail(ctx, userState, index) {
+  const preview = userState.thumbnails[index];
+  const position = userState.timestamps[index];
+  
+  if (typeof position !== 'number') {
+    return preview;
+  }
+  
+  try {
+    const cached = await thumbnailGenerator.getCachedFullFrame(userState.videoUniqueId, position);
+    
+    if (cached) {
+      return cached;
+    }
+    
+    const fileInfo = await getFileInfo(ctx.telegram, userState.videoId);
+    const fileUrl = `https://api.telegram.org/file/bot${BOT_TOKEN}/${fileInfo.file_path}`;
+    return await thumbnailGenerator.extractFullFrame(fileUrl, position, userState.videoUniqueId);
+  } catch (error) {
+    logError('Error extracting full-size thumbnail:', error);
+    return null;
+  }
+}
+
+// Get file info from Telegram, reusing the result while its path is valid
+async function getFileInfo(telegram, fileId) {
+  let fileInfo = fileInfoCache.get(fileId);
+  
+  if (!fileInfo) {
+    fileInfo = await telegram.getFile(fileId);
+    fileInfoCache.set(fileId, fileInfo);
+  }
+  
+  return fileInfo;
+}
+
+// Broadcast flow: send the next message to all channels
+async function handleBroadcastMessage(ctx, next) {
+  // Let commands reach their own handlers
+  if (ctx.message.text.startsWith('/')) return next();
+  
+  try {
+    const broadcastMessage = ctx.message.text;
+    
+    await ctx.scene.leave();
+    
+    ctx.reply('Broadcasting message to all channels...');
+    
+    // Send broadcast to all channels at once
+    const channels = [...CHANNEL_MAP];
+    const results = await Promise.allSettled(channels.map(([channelName, channelId]) =>
+      broadcastLimiter.schedule(() => ctx.telegram.sendMessage(channelId, broadcastMessage))
+    ));
+    
+    results.forEach((result, i) => {
+      const channelName = channels[i][0];
+      
+      if (result.status === 'fulfilled') {
+        logActivity(`Broadcast sent to ${channelName}`);
+      } else {
+        logError(`Error broadcasting to ${channelName}:`, result.reason);
+      }
+    });
+    
+    ctx.reply('Broadcast completed!');
+  } catch (error) {
+    logError('Error handling broadcast message:', error);
+    ctx.reply('Sorry, an error occurred. Please try again.');
   }
 }
 
-// Handle text messages
-bot.on('text', adminCheckMiddleware, async (ctx) => {
+// Post flow: handle thumbnail selection
+async function handleThumbnailSelectionStep(ctx, next) {
+  // Let commands reach their own handlers
+  if (ctx.message.text.startsWith('/')) return next();
+  
   const userId = ctx.from.id;
   
   try {
@@ -563,113 +836,154 @@ bot.on('text', adminCheckMiddleware, async (ctx) => {
     const userState = await UserState.findOne({ userId });
     
     if (!userState) {
-      return ctx.reply('Please use /start to begin using the bot.');
+      ctx.reply('Please send me a video first, then I can generate thumbnails for you.');
+      return ctx.scene.leave();
     }
     
-    // Handle broadcast message
-    if (userState.waitingForBroadcastMessage) {
-      const broadcastMessage = ctx.message.text;
-      
-      // Update user state
-      userState.waitingForBroadcastMessage = false;
-      await userState.save();
-      
-      ctx.reply('Broadcasting message to all channels...');
-      
-      // Send broadcast to all channels
-      for (const [channelName, channelId] of Object.entries(CHANNELS)) {
-        try {
-          await ctx.telegram.sendMessage(
-            channelId,
-            broadcastMessage
-          );
-          logActivity(`Broadcast sent to ${channelName}`);
-        } catch (error) {
-          logError(`Error broadcasting to ${channelName}:`, error);
-        }
-      }
-      
-      ctx.reply('Broadcast completed!');
-      return;
+    if (!userState.thumbnails || userState.thumbnails.length === 0) {
+      return ctx.reply('Please upload an image to use as a thumbnail.');
     }
     
-    // Handle thumbnail selection
-    if (userState.waitingForThumbnailSelection) {
-      const choice = parseInt(ctx.message.text);
-      
-      if (isNaN(choice) || choice < 1 || choice > userState.thumbnails.length) {
-        return ctx.reply(`Please enter a valid number between 1 and ${userState.thumbnails.length}.`);
-      }
-      
-      const selectedThumbnail = userState.thumbnails[choice - 1];
-      
+    const choice = parseInt(ctx.message.text);
+    
+    if (isNaN(choice) || choice < 1 || choice > userState.thumbnails.length) {
+      return ctx.reply(`Please enter a valid number between 1 and ${userState.thumbnails.length}.`);
+    }
+    
+    const selected = await getFullSizeThumbnail(ctx, userState, choice - 1);
+    
+    if (!selected) {
+      return ctx.reply('Sorry, I couldn\'t extract that thumbnail at full size. Please choose another number or upload an image instead.');
+    }
+    
+    // Update database
+    userState.selectedThumbnail = selected;
+    userState.selectedThumbnailFileId = undefined;
+    await userState.save();
+    
+    // Ask for URL
+    ctx.reply('Great! Now please send me the URL to include with this post:');
+    ctx.wizard.selectStep(POST_STEP_URL);
+  } catch (error) {
+    logError('Error handling thumbnail selection:', error);
+    ctx.reply('Sorry, an error occurred. Please try again.');
+  }
+}
+
+// Post flow: handle manual thumbnail upload
+async function handleManualThumbnailStep(ctx) {
+  const userId = ctx.from.id;
+  
+  try {
+    // Retrieve user state from database
+    const userState = await UserState.findOne({ userId });
+    
+    if (!userState) {
+      ctx.reply('Please send me a video first, then I can generate thumbnails for you.');
+      return ctx.scene.leave();
+    }
+    
+    const photo = largestPhoto(ctx.message.photo);
+    const fileId = photo.file_id;
+    
+    // Download the manually uploaded thumbnail
+    const thumbnailPath = await thumbnailGenerator.downloadThumbnailFromTelegram(fileId, BOT_TOKEN);
+    
+    if (thumbnailPath) {
       // Update database
-      userState.selectedThumbnail = selectedThumbnail;
-      userState.waitingForThumbnailSelection = false;
-      userState.waitingForUrl = true;
+      userState.selectedThumbnail = thumbnailPath;
+      userState.selectedThumbnailFileId = fileId;
       await userState.save();
       
       // Ask for URL
-      ctx.reply('Great! Now please send me the URL to include with this post:');
-      
-    } else if (userState.waitingForUrl) {
-      // Save URL and ask for caption
-      userState.url = ctx.message.text;
-      userState.waitingForUrl = false;
-      userState.waitingForCaption = true;
-      await userState.save();
-      
-      ctx.reply('Thanks! Now please send me the caption for this post:');
-      
-    } else if (userState.waitingForCaption) {
-      // Save caption and ask which channel to post to
-      userState.caption = ctx.message.text;
-      userState.waitingForCaption = false;
-      userState.waitingForChannelSelection = true;
-      await userState.save();
-      
-      // Create keyboard with channel options
-      const channelKeyboard = Markup.inlineKeyboard([
-        [
-          Markup.button.callback('STUFF', 'channel_STUFF'), 
-          Markup.button.callback('MOVIE', 'channel_MOVIE')
-        ]
-      ]);
-      
-      ctx.reply('Select which channel to post to:', channelKeyboard);
+      ctx.reply('Thanks! Now please send me the URL to include with this post:');
+      ctx.wizard.selectStep(POST_STEP_URL);
+    } else {
+      throw new Error('Failed to download thumbnail');
     }
   } catch (error) {
-    logError('Error handling text message:', error);
+    logError('Error handling manually uploaded thumbnail:', error);
+    ctx.reply('Sorry, there was an error processing your thumbnail. Please try again.');
+  }
+}
+
+// Post flow: save URL and ask for caption
+async function handleUrlStep(ctx, next) {
+  // Let commands reach their own handlers
+  if (ctx.message.text.startsWith('/')) return next();
+  
+  try {
+    await UserState.findOneAndUpdate({ userId: ctx.from.id }, { url: ctx.message.text });
+    
+    ctx.reply('Thanks! Now please send me the caption for this post:');
+    ctx.wizard.next();
+  } catch (error) {
+    logError('Error handling URL:', error);
     ctx.reply('Sorry, an error occurred. Please try again.');
   }
-});
+}
+
+// Post flow: save caption and ask which channel to post to
+async function handleCaptionStep(ctx, next) {
+  // Let commands reach their own handlers
+  if (ctx.message.text.startsWith('/')) return next();
+  
+  try {
+    await UserState.findOneAndUpdate({ userId: ctx.from.id }, { caption: ctx.message.text });
+    
+    ctx.reply('Select which channel to post to:', CHANNEL_KEYBOARD);
+    ctx.wizard.next();
+  } catch (error) {
+    logError('Error handling caption:', error);
+    ctx.reply('Sorry, an error occurred. Please try again.');
+  }
+}
 
-// Handle channel selection
-bot.action(/channel_(.+)/, adminCheckMiddleware, async (ctx) => {
+// Post flow: handle channel selection
+async function handleChannelStep(ctx) {
   const userId = ctx.from.id;
-  const selectedChannel = ctx.match[1]; // STUFF or MOVIE
+  const selectedChannel = ctx.callbackQuery.data.slice('channel_'.length); // STUFF or MOVIE
+  const channelId = CHANNEL_MAP.get(selectedChannel);
   
   try {
+    if (!channelId) {
+      return ctx.answerCbQuery('Unknown channel');
+    }
+    
     // Retrieve user state from database
     const userState = await UserState.findOne({ userId });
     
-    if (!userState) return;
+    if (!userState) return ctx.scene.leave();
     
     await ctx.answerCbQuery(`Selected ${selectedChannel} channel`);
     
     // Update database
-    userState.selectedChannel = CHANNELS[selectedChannel];
+    userState.selectedChannel = channelId;
     userState.channelName = selectedChannel;
     await userState.save();
     
     ctx.reply(`Preparing to post to ${selectedChannel} channel...`);
     
-    // Post to channel
-    await postToChannel(ctx, userId);
+    // Post to channel; on failure stay on this step so the user can retry
+    if (await postToChannel(ctx, userId)) {
+      await ctx.scene.leave();
+    }
   } catch (error) {
     logError('Error handling channel selection:', error);
     ctx.reply('Sorry, there was an error with your channel selection. Please try again.');
   }
+}
+
+// Answer channel buttons pressed after their post flow has ended (e.g. a
+// double tap, whose second tap is handled once the post has been sent), so
+// the client doesn't keep showing a loading spinner
+bot.action(/^channel_/, adminCheckMiddleware, (ctx) => {
+  return ctx.answerCbQuery('This post has already been sent or cancelled.');
+});
+
+// Handle text sent outside of any flow
+bot.on('text', adminCheckMiddleware, (ctx) => {
+  ctx.reply('Please send me a video first, then I can generate thumbnails for you.');
 });
 
 // Post to channel function
@@ -685,21 +999,21 @@ async function postToChannel(ctx, userId) {
     const channelId = userState.selectedChannel;
     const channelName = userState.channelName;
     
-    // Create inline keyboard with URL button and Request Video button
-    const inlineKeyboard = Markup.inlineKeyboard([
-      [Markup.button.url('Link mawas', userState.url)],
-      [Markup.button.url('Request Video', 'https://t.me/teraseeubot')]
-    ]);
+    const inlineKeyboard = buildPostKeyboard(userState.url);
     
-    // Verify thumbnail exists
-    if (!userState.selectedThumbnail || !fs.existsSync(userState.selectedThumbnail)) {
+    // Reuse the photo if it is already on Telegram; only an upload needs the
+    // file on disk
+    if (!userState.selectedThumbnailFileId &&
+      (!userState.selectedThumbnail || !(await fileExists(userState.selectedThumbnail)))) {
       throw new Error('Selected thumbnail file not found');
     }
     
+    const photo = userState.selectedThumbnailFileId || { source: userState.selectedThumbnail };
+    
     // Post photo with caption and inline buttons to channel
     const result = await ctx.telegram.sendPhoto(
       channelId,
-      { source: userState.selectedThumbnail },
+      photo,
       { 
         caption: userState.caption,
         reply_markup: inlineKeyboard.reply_markup
@@ -711,6 +1025,10 @@ async function postToChannel(ctx, userId) {
     // Generate a unique post ID for tracking
     const postId = uuidv4().substring(0, 8);
     
+    // Cached frames can be evicted, so the post keeps its own hard link to
+    // the thumbnail for resends instead of pointing into the cache
+    const thumbnailPath = await keepPostThumbnail(userState.selectedThumbnail, postId);
+    
     // Save post information to database for future reference
     const post = new Post({
       postId: postId,
@@ -718,8 +1036,8 @@ async function postToChannel(ctx, userId) {
       url: userState.url,
       channelId: channelId,
       channelName: userState.channelName,
-      thumbnailPath: userState.selectedThumbnail,
-      thumbnailFileId: result.photo[0].file_id, // Store Telegram's file_id for future use
+      thumbnailPath: thumbnailPath,
+      thumbnailFileId: largestPhoto(result.photo).file_id, // Store Telegram's file_id for future use
       messageId: result.message_id,
       createdBy: userId
     });
@@ -730,61 +1048,55 @@ async function postToChannel(ctx, userId) {
     
     // Clean up
     await cleanupTempFiles(userId);
+    return true;
   } catch (error) {
     logError('Error posting to channel:', error);
     ctx.reply('Sorry, there was an error posting to the channel. Please make sure the bot is an admin in the channel with posting permissions.');
+    return false;
   }
 }
 
-// Handle manual thumbnail upload
-bot.on('photo', adminCheckMiddleware, async (ctx) => {
-  const userId = ctx.from.id;
+// Telegram lists the sizes of a photo smallest first
+function largestPhoto(sizes) {
+  return sizes[sizes.length - 1];
+}
+
+// Path a post should keep its thumbnail under. Cached frames are linked
+// into the posts directory; anything else is already owned by the post.
+async function keepPostThumbnail(thumbnailPath, postId) {
+  if (!thumbnailGenerator.isCachedThumbnail(thumbnailPath)) {
+    return thumbnailPath;
+  }
+  
+  const postThumbnailPath = path.join(postThumbnailDir, `${postId}${path.extname(thumbnailPath)}`);
   
   try {
-    // Retrieve user state from database
-    const userState = await UserState.findOne({ userId });
-    
-    if (!userState || !userState.waitingForManualThumbnail) {
-      return ctx.reply('Please send me a video first, then I can generate thumbnails for you.');
-    }
-    
-    const photo = ctx.message.photo[ctx.message.photo.length - 1]; // Get the highest resolution
-    const fileId = photo.file_id;
-    
-    // Download the manually uploaded thumbnail
-    const thumbnailPath = await thumbnailGenerator.downloadThumbnailFromTelegram(fileId, BOT_TOKEN);
-    
-    if (thumbnailPath) {
-      // Update database
-      userState.selectedThumbnail = thumbnailPath;
-      userState.waitingForManualThumbnail = false;
-      userState.waitingForUrl = true;
-      await userState.save();
-      
-      // Ask for URL
-      ctx.reply('Thanks! Now please send me the URL to include with this post:');
-    } else {
-      throw new Error('Failed to download thumbnail');
-    }
+    await linkOrCopy(thumbnailPath, postThumbnailPath);
+    return postThumbnailPath;
   } catch (error) {
-    logError('Error handling manually uploaded thumbnail:', error);
-    ctx.reply('Sorry, there was an error processing your thumbnail. Please try again.');
+    logError(`Error keeping thumbnail for post ${postId}:`, error);
+    return thumbnailPath;
   }
+}
+
+// Inline keyboard for a channel post: the post's link plus the shared
+// Request Video button
+function buildPostKeyboard(url) {
+  return Markup.inlineKeyboard([
+    [Markup.button.url('Link mawas', url)],
+    [REQUEST_VIDEO_BUTTON]
+  ]);
+}
+
+// Handle photos sent outside of the post flow
+bot.on('photo', adminCheckMiddleware, (ctx) => {
+  ctx.reply('Please send me a video first, then I can generate thumbnails for you.');
 });
 
 // Error handling for thumbnail generation
-async function handleThumbnailGenerationError(ctx, userId) {
+async function handleThumbnailGenerationError(ctx) {
   try {
-    ctx.reply('I was unable to automatically extract thumbnails from your video. Please upload an image to use as a thumbnail instead.');
-    
-    // Update user state in database
-    await UserState.findOneAndUpdate(
-      { userId },
-      { 
-        waitingForManualThumbnail: true,
-        waitingForThumbnailSelection: false
-      }
-    );
+    await ctx.reply('I was unable to automatically extract thumbnails from your video. Please upload an image to use as a thumbnail instead.');
   } catch (error) {
     logError('Error handling thumbnail generation error:', error);
     ctx.reply('An error occurred. Please try starting over with /start');
@@ -792,63 +1104,65 @@ async function handleThumbnailGenerationError(ctx, userId) {
 }
 
 // Clean up temporary files with improved error handling
-async function cleanupTempFiles(userId) {
+async function cleanupTempFiles(userId, sessionId) {
   try {
-    // Get user state from database
-    const userState = await UserState.findOne({ userId });
+    // Get user state from database. With a session ID, a state that has
+    // already moved on to a newer flow is left alone.
+    const userState = await UserState.findOne(sessionId ? { userId, sessionId } : { userId });
     
     if (!userState) return;
     
-    // Clean up thumbnails
+    // Clean up thumbnails, leaving cached previews for the next time the video is sent
     if (userState.thumbnails && Array.isArray(userState.thumbnails)) {
-      for (const thumbnail of userState.thumbnails) {
-        try {
-          if (thumbnail && fs.existsSync(thumbnail)) {
-            fs.unlinkSync(thumbnail);
-            logActivity(`Deleted thumbnail: ${thumbnail}`);
-          }
-        } catch (err) {
-          logError(`Error deleting thumbnail file ${thumbnail}:`, err);
-        }
+      const sessionThumbnails = userState.thumbnails.filter((thumbnail) =>
+        thumbnail && !thumbnailGenerator.isCachedThumbnail(thumbnail)
+      );
+      
+      const { removed, errors } = await removeFiles(sessionThumbnails);
+      
+      logDebug(() => `Deleted ${removed} thumbnails for user ${userId}`);
+      
+      if (errors.length > 0) {
+        logError(`Error deleting ${errors.length} thumbnail files:`, errors[0]);
       }
     }
     
-    // Don't delete selected thumbnail if it was saved to a post
-    // Just check if the file exists first
-    if (userState.selectedThumbnail && fs.existsSync(userState.selectedThumbnail)) {
-      const recentPost = await Post.findOne({ thumbnailPath: userState.selectedThumbnail });
+    // Don't delete selected thumbnail if it was saved to a post. A missing
+    // file is fine: removeFile treats it as already deleted.
+    if (userState.selectedThumbnail && !thumbnailGenerator.isCachedThumbnail(userState.selectedThumbnail)) {
+      const usedByPost = await Post.exists({ thumbnailPath: userState.selectedThumbnail });
       
-      if (!recentPost) {
+      if (!usedByPost) {
         // If not used in a post, delete it
         try {
-          fs.unlinkSync(userState.selectedThumbnail);
-          logActivity(`Deleted selected thumbnail: ${userState.selectedThumbnail}`);
+          if (await removeFile(userState.selectedThumbnail)) {
+            logDebug(() => `Deleted selected thumbnail: ${userState.selectedThumbnail}`);
+          }
         } catch (err) {
           logError(`Error deleting selected thumbnail file ${userState.selectedThumbnail}:`, err);
         }
       }
     }
     
-    // Reset state but keep userId
+    // Reset state but keep userId, unless a new flow has started meanwhile
     await UserState.findOneAndUpdate(
-      { userId },
+      { userId, sessionId: userState.sessionId || null },
       {
         $unset: {
           sessionId: "",
           videoId: "",
+          videoUniqueId: "",
           videoName: "",
+          mimeType: "",
+          videoThumbnailId: "",
           videoWidth: "",
           videoHeight: "",
           aspectRatio: "",
           duration: "",
           thumbnails: "",
+          timestamps: "",
           selectedThumbnail: "",
-          waitingForThumbnailSelection: "",
-          waitingForManualThumbnail: "",
-          waitingForUrl: "",
-          waitingForCaption: "",
-          waitingForChannelSelection: "",
-          waitingForBroadcastMessage: "",
+          selectedThumbnailFileId: "",
           url: "",
           caption: "",
           selectedChannel: "",
@@ -64,6 +64,8 @@ const postSchema = new mongoose.Schema({
 
 // Create indexes for better query performance
 postSchema.index({ channelId: 1, createdAt: -1 });
+postSchema.index({ createdAt: -1 }); // Newest-first listing in /posts
+postSchema.index({ thumbnailPath: 1 }, { sparse: true }); // Thumbnail cleanup checks
 postSchema.index({ postId: 1 });
 postSchema.index({ createdBy: 1 });
 postSchema.index({ isResend: 1 });
@@ -12,43 +12,23 @@ const userStateSchema = new mongoose.Schema({
   },
   // Video information
   videoId: String,
+  videoUniqueId: String, // Stable across re-sends, keys the thumbnail cache
   videoName: String,
+  mimeType: String,
+  videoThumbnailId: String, // Thumbnail Telegram generated for the video
   videoWidth: Number,
   videoHeight: Number,
   aspectRatio: String,
   duration: Number,
   // Processing state
   thumbnails: [String], // Array of file paths
+  timestamps: [Number], // Video position of each thumbnail, null if not extracted
   selectedThumbnail: String,
+  selectedThumbnailFileId: String, // Set when the selected thumbnail is already on Telegram
   url: String,
   caption: String,
   selectedChannel: String,
   channelName: String,
-  // State flags
-  waitingForThumbnailSelection: {
-    type: Boolean,
-    default: false
-  },
-  waitingForManualThumbnail: {
-    type: Boolean,
-    default: false
-  },
-  waitingForUrl: {
-    type: Boolean,
-    default: false
-  },
-  waitingForCaption: {
-    type: Boolean,
-    default: false
-  },
-  waitingForChannelSelection: {
-    type: Boolean,
-    default: false
-  },
-  waitingForBroadcastMessage: {
-    type: Boolean,
-    default: false
-  },
   // Timestamps
   createdAt: {
     type: Date,
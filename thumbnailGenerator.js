@@ -1,9 +1,100 @@
-const { spawn } = require('child_process');
 const fs = require('fs');
 const path = require('path');
 const https = require('https');
-const { v4: uuidv4 } = require('uuid');
-const { logActivity, logError } = require('./utils/logger');
+const os = require('os');
+const { execFile } = require('child_process');
+const { logActivity, logDebug, logError } = require('./utils/logger');
+const { httpsAgent, downloadFile, downloadFileHead } = require('./utils/http');
+const { WorkerPool } = require('./utils/workerPool');
+const { fileExists, removeFile, removeFiles, tempName } = require('./utils/files');
+
+// Number of CPU cores, used to bound concurrent ffmpeg processes
+const CPU_COUNT = Math.max(os.cpus().length, 1);
+
+// Worker threads that run ffmpeg, shared across all users so concurrent
+// jobs never run more ffmpeg processes than there are cores
+const thumbnailPool = new WorkerPool(path.join(__dirname, 'workers', 'thumbnailer.js'), CPU_COUNT);
+
+// Hardware decoders to try, in order of preference, when GPU decoding is
+// enabled with USE_GPU_DECODE=1
+const PREFERRED_HWACCELS = ['cuda', 'videotoolbox', 'vaapi', 'qsv'];
+
+/**
+ * Run ffmpeg and report whether it exited cleanly
+ * @param {string[]} args - ffmpeg arguments
+ * @returns {Promise<string|null>} - Standard output, or null if ffmpeg failed
+ */
+function runFfmpeg(args) {
+  return new Promise((resolve) => {
+    execFile('ffmpeg', ['-hide_banner', ...args], (error, stdout) => {
+      resolve(error ? null : stdout);
+    });
+  });
+}
+
+/**
+ * Find a hardware decoder the host can actually use. `ffmpeg -hwaccels` only
+ * lists what the build was compiled with (a stock build lists cuda and vaapi
+ * with no GPU present), so each candidate is checked by creating its device.
+ * @returns {Promise<string|null>} - Name of the decoder, or null to decode in software
+ */
+async function detectHwaccel() {
+  if (process.env.USE_GPU_DECODE !== '1') return null;
+  
+  const stdout = await runFfmpeg(['-hwaccels']);
+  
+  if (stdout === null) {
+    logError('Could not list ffmpeg hardware decoders');
+    return null;
+  }
+  
+  const available = stdout.split('\n').map((line) => line.trim());
+  
+  for (const name of PREFERRED_HWACCELS.filter((candidate) => available.includes(candidate))) {
+    const usable = await runFfmpeg([
+      '-loglevel', 'error',
+      '-init_hw_device', name,
+      '-f', 'lavfi', '-i', 'nullsrc',
+      '-frames:v', '1',
+      '-f', 'null', '-'
+    ]);
+    
+    if (usable !== null) {
+      logActivity(`Using ${name} hardware decoding`);
+      return name;
+    }
+    
+    logDebug(() => `Hardware decoder ${name} is compiled in but has no usable device`);
+  }
+  
+  logActivity('No usable hardware decoder found, decoding in software');
+  return null;
+}
+
+// Size of the leading byte range fetched for thumbnails near the start (8MB)
+const HEAD_BYTES = 8 * 1024 * 1024;
+
+// Estimated offsets closer than this to the end of the head are fetched
+// remotely, leaving room for the keyframe before the position (2MB)
+const HEAD_MARGIN_BYTES = 2 * 1024 * 1024;
+
+// Containers that can be decoded from a leading byte range
+const STREAMABLE_MIME_TYPES = ['video/mp4', 'video/webm', 'video/x-matroska'];
+
+// Height of the previews offered for selection. Only the chosen one is
+// extracted again at full size.
+const PREVIEW_HEIGHT = 180;
+
+// Scale filter for the chosen thumbnail. Telegram stores photos at no more
+// than 1280px on the longest side, so larger frames are shrunk before upload.
+const FULL_FRAME_SCALE = 'scale=w=min(iw\\,1280):h=min(ih\\,1280):force_original_aspect_ratio=decrease';
+
+// Total size of cached previews kept on disk before the least recently used
+// videos are evicted (1GB)
+const CACHE_MAX_BYTES = 1024 * 1024 * 1024;
+
+// Name of the file listing a cached video's previews and their positions
+const CACHE_MANIFEST = 'manifest.json';
 
 /**
  * Class to handle thumbnail generation from videos
@@ -15,26 +106,41 @@ class ThumbnailGenerator {
    */
   constructor(tempDir) {
     this.tempDir = tempDir;
+    this.cacheDir = path.join(tempDir, 'cache');
+    
+    // Detected once; jobs wait for it so the first extraction isn't raced
+    this.hwaccel = detectHwaccel();
     
-    // Create temp directory if it doesn't exist
-    if (!fs.existsSync(this.tempDir)) {
-      fs.mkdirSync(this.tempDir, { recursive: true });
+    // Create temp and cache directories if they don't exist
+    if (!fs.existsSync(this.cacheDir)) {
+      fs.mkdirSync(this.cacheDir, { recursive: true });
     }
     
     logActivity(`ThumbnailGenerator initialized with tempDir: ${this.tempDir}`);
   }
   
   /**
-   * Generate thumbnails from a video URL
+   * Generate small preview thumbnails from a video URL
    * @param {string} videoUrl - URL of the video file
    * @param {Object} videoInfo - Video metadata
-   * @returns {Promise<string[]>} - Array of paths to generated thumbnails
+   * @returns {Promise<Object>} - Paths to generated previews and their positions in seconds
    */
   async generateThumbnails(videoUrl, videoInfo) {
-    const sessionId = uuidv4();
+    // The same video sent again has the same file_unique_id, so its previews
+    // can be reused without touching the network or ffmpeg
+    const cached = await this.getCachedThumbnails(videoInfo.file_unique_id);
+    
+    if (cached) {
+      logActivity(`Using ${cached.thumbnails.length} cached thumbnails for video ${videoInfo.file_unique_id}`);
+      return cached;
+    }
+    
+    const sessionId = tempName('video');
     const thumbnails = [];
+    const timestamps = [];
+    let headPath = null;
     
-    logActivity(`Starting thumbnail generation for session ${sessionId}`);
+    logDebug(() => `Starting thumbnail generation for session ${sessionId}`);
     
     try {
       // Calculate thumbnail positions (at 10%, 25%, 50%, and 75% of the video)
@@ -45,88 +151,374 @@ class ThumbnailGenerator {
         Math.floor(videoInfo.duration * 0.75)
       ];
       
-      // Generate a thumbnail for each position
-      for (let i = 0; i < positions.length; i++) {
-        const position = positions[i];
-        const thumbnailPath = path.join(this.tempDir, `${sessionId}_thumb_${i}.jpg`);
-        
-        logActivity(`Generating thumbnail ${i+1} at position ${position}s`);
-        
-        try {
-          await this.extractFrameWithFfmpeg(videoUrl, position, thumbnailPath);
+      const outputPaths = positions.map((position, i) =>
+        path.join(this.tempDir, `${sessionId}_thumb_${i}.webp`)
+      );
+      
+      logDebug(() => `Generating ${positions.length} thumbnails at positions ${positions.join('s, ')}s`);
+      
+      const items = positions.map((position, i) => ({ position, outputPath: outputPaths[i] }));
+      
+      // Positions that fall inside the first few MB are extracted from a
+      // locally fetched head of the file instead of the full remote URL
+      const headItems = this.canUseVideoHead(videoInfo)
+        ? items.filter((item) =>
+            (videoInfo.file_size * item.position) / videoInfo.duration < HEAD_BYTES - HEAD_MARGIN_BYTES)
+        : [];
+      const remoteItems = items.filter((item) => !headItems.includes(item));
+      
+      if (headItems.length > 0) {
+        headPath = path.join(this.tempDir, `${sessionId}_head`);
+      }
+      
+      // Later positions don't wait for the head to be fetched
+      await Promise.all([
+        this.extractFrames(videoUrl, remoteItems),
+        headItems.length > 0 ? this.extractFromHead(videoUrl, headPath, headItems) : null
+      ]);
+      
+      const results = await Promise.all(outputPaths.map(fileExists));
+      
+      outputPaths.forEach((thumbnailPath, i) => {
+        if (results[i]) {
           thumbnails.push(thumbnailPath);
-          logActivity(`Generated thumbnail ${i+1}: ${thumbnailPath}`);
-        } catch (error) {
-          logError(`Failed to generate thumbnail ${i+1}:`, error);
-          // Continue with next thumbnail
+          timestamps.push(positions[i]);
+          logDebug(() => `Generated thumbnail ${i+1}: ${thumbnailPath}`);
         }
-      }
+      });
       
       logActivity(`Generated ${thumbnails.length} thumbnails for session ${sessionId}`);
-      return thumbnails;
+      return await this.cacheThumbnails(videoInfo.file_unique_id, { thumbnails, timestamps });
     } catch (error) {
       logError(`Error generating thumbnails for session ${sessionId}:`, error);
       // Clean up any generated thumbnails on error
-      this.cleanupThumbnails(thumbnails);
-      return [];
+      await this.cleanupThumbnails(thumbnails);
+      return { thumbnails: [], timestamps: [] };
+    } finally {
+      if (headPath) {
+        await removeFile(headPath).catch(() => {});
+      }
     }
   }
   
   /**
-   * Extract a frame from video using ffmpeg
-   * @param {string} videoUrl - URL of the video
-   * @param {number} position - Position in seconds
-   * @param {string} outputPath - Where to save the extracted frame
+   * Extract previews from a locally fetched head of the video, retrying any
+   * the head could not produce (e.g. moov atom at the end of the file)
+   * against the full URL
+   * @param {string} videoUrl - URL of the video file
+   * @param {string} headPath - Where to save the head
+   * @param {Object[]} items - Positions in seconds and their output paths
    * @returns {Promise<void>}
    */
-  extractFrameWithFfmpeg(videoUrl, position, outputPath) {
-    return new Promise((resolve, reject) => {
-      // Set timeout to prevent hanging
-      const timeout = setTimeout(() => {
-        ffmpeg.kill('SIGKILL');
-        reject(new Error('FFmpeg process timed out after 30 seconds'));
-      }, 30000);
-      
-      // Convert position to FFmpeg format (HH:MM:SS)
-      const formattedTime = new Date(position * 1000).toISOString().substring(11, 19);
-      
-      // Run FFmpeg to extract frame
-      const ffmpeg = spawn('ffmpeg', [
-        '-ss', formattedTime,
-        '-i', videoUrl,
-        '-vframes', '1',
-        '-q:v', '2',
-        '-y',
-        outputPath
-      ]);
+  async extractFromHead(videoUrl, headPath, items) {
+    try {
+      await downloadFileHead(videoUrl, headPath, HEAD_BYTES);
+      logDebug(() => `Fetched video head for ${items.length} thumbnails`);
+      await this.extractFrames(headPath, items);
+    } catch (error) {
+      logError('Could not use video head, falling back to full URL:', error);
+    }
+    
+    const headResults = await Promise.all(items.map((item) => fileExists(item.outputPath)));
+    await this.extractFrames(videoUrl, items.filter((item, i) => !headResults[i]));
+  }
+  
+  /**
+   * Get the directory holding the cached previews of a video
+   * @param {string} uniqueId - Telegram file_unique_id of the video
+   * @returns {string|null} - Cache directory, or null if the id can't be used
+   */
+  getCacheEntryDir(uniqueId) {
+    if (!uniqueId || !/^[\w-]+$/.test(uniqueId)) return null;
+    
+    return path.join(this.cacheDir, uniqueId);
+  }
+  
+  /**
+   * Check whether a thumbnail path belongs to the preview cache, in which
+   * case it is shared between sessions and must not be deleted with them
+   * @param {string} thumbnailPath - Thumbnail path
+   * @returns {boolean} - True if the file is a cached preview
+   */
+  isCachedThumbnail(thumbnailPath) {
+    return thumbnailPath.startsWith(this.cacheDir + path.sep);
+  }
+  
+  /**
+   * Look up the cached previews of a video
+   * @param {string} uniqueId - Telegram file_unique_id of the video
+   * @returns {Promise<Object|null>} - Preview paths and positions, or null on a miss
+   */
+  async getCachedThumbnails(uniqueId) {
+    const entryDir = this.getCacheEntryDir(uniqueId);
+    
+    if (!entryDir) return null;
+    
+    const manifestPath = path.join(entryDir, CACHE_MANIFEST);
+    
+    try {
+      const manifest = JSON.parse(await fs.promises.readFile(manifestPath, 'utf8'));
+      const thumbnails = manifest.files.map((file) => path.join(entryDir, file));
+      const results = await Promise.all(thumbnails.map(fileExists));
       
-      let stdoutData = '';
-      let stderrData = '';
+      // Drop incomplete entries so the video can be cached again
+      if (thumbnails.length === 0 || results.includes(false)) {
+        await fs.promises.rm(entryDir, { recursive: true, force: true });
+        return null;
+      }
       
-      ffmpeg.stdout.on('data', (data) => {
-        stdoutData += data.toString();
-      });
+      // Mark the entry as recently used for eviction
+      const now = new Date();
+      await fs.promises.utimes(manifestPath, now, now);
       
-      ffmpeg.stderr.on('data', (data) => {
-        stderrData += data.toString();
-      });
+      return { thumbnails, timestamps: manifest.timestamps };
+    } catch (error) {
+      if (error.code !== 'ENOENT') {
+        logError(`Error reading thumbnail cache for ${uniqueId}:`, error);
+      }
+      return null;
+    }
+  }
+  
+  /**
+   * Move freshly generated previews into the cache
+   * @param {string} uniqueId - Telegram file_unique_id of the video
+   * @param {Object} result - Preview paths and positions
+   * @returns {Promise<Object>} - Preview paths (now in the cache) and positions
+   */
+  async cacheThumbnails(uniqueId, result) {
+    const entryDir = this.getCacheEntryDir(uniqueId);
+    
+    if (!entryDir || result.thumbnails.length === 0) return result;
+    
+    // Fill a private directory first and rename it into place, so readers
+    // never see a half-written entry
+    const stagingDir = path.join(this.cacheDir, tempName('staging'));
+    const files = result.thumbnails.map((thumbnail, i) => `${i}${path.extname(thumbnail)}`);
+    
+    try {
+      await fs.promises.mkdir(stagingDir);
+      await Promise.all(result.thumbnails.map((thumbnail, i) =>
+        fs.promises.rename(thumbnail, path.join(stagingDir, files[i]))
+      ));
+      await fs.promises.writeFile(
+        path.join(stagingDir, CACHE_MANIFEST),
+        JSON.stringify({ files, timestamps: result.timestamps })
+      );
+      await fs.promises.rename(stagingDir, entryDir);
+      
+      this.pruneCache().catch((error) => logError('Error pruning thumbnail cache:', error));
+      
+      return {
+        thumbnails: files.map((file) => path.join(entryDir, file)),
+        timestamps: result.timestamps
+      };
+    } catch (error) {
+      // Another session may have cached the same video first
+      const cached = await this.getCachedThumbnails(uniqueId);
       
-      ffmpeg.on('close', (code) => {
-        clearTimeout(timeout);
+      if (cached) {
+        await fs.promises.rm(stagingDir, { recursive: true, force: true }).catch(() => {});
+        return cached;
+      }
+      
+      logError(`Error caching thumbnails for ${uniqueId}:`, error);
+      
+      // Put the previews back so this session can still use them uncached
+      await Promise.all(result.thumbnails.map((thumbnail, i) =>
+        fs.promises.rename(path.join(stagingDir, files[i]), thumbnail).catch(() => {})
+      ));
+      await fs.promises.rm(stagingDir, { recursive: true, force: true }).catch(() => {});
+      return result;
+    }
+  }
+  
+  /**
+   * Evict the least recently used cache entries until the cache fits its size cap
+   * @returns {Promise<void>}
+   */
+  async pruneCache() {
+    const dirents = await fs.promises.readdir(this.cacheDir, { withFileTypes: true });
+    
+    const entries = await Promise.all(dirents.filter((dirent) => dirent.isDirectory()).map(async (dirent) => {
+      const entryDir = path.join(this.cacheDir, dirent.name);
+      
+      try {
+        // One stat per file gives both the entry size and, from the
+        // manifest, when it was last used
+        const files = await fs.promises.readdir(entryDir);
+        const stats = await Promise.all(files.map((file) => fs.promises.stat(path.join(entryDir, file))));
+        const manifest = stats[files.indexOf(CACHE_MANIFEST)];
         
-        if (code === 0 && fs.existsSync(outputPath)) {
-          resolve(outputPath);
-        } else {
-          const error = new Error(`FFmpeg process failed with code ${code}: ${stderrData}`);
-          reject(error);
-        }
+        if (!manifest) return null;
+        
+        return {
+          entryDir,
+          size: stats.reduce((total, stat) => total + stat.size, 0),
+          lastUsed: manifest.mtimeMs
+        };
+      } catch (error) {
+        // Entries still being staged or removed have no manifest yet
+        return null;
+      }
+    }));
+    
+    const cacheEntries = entries.filter(Boolean).sort((a, b) => a.lastUsed - b.lastUsed);
+    let totalSize = cacheEntries.reduce((total, entry) => total + entry.size, 0);
+    
+    for (const entry of cacheEntries) {
+      if (totalSize <= CACHE_MAX_BYTES) break;
+      
+      await fs.promises.rm(entry.entryDir, { recursive: true, force: true });
+      totalSize -= entry.size;
+      logActivity(`Evicted cached thumbnails: ${entry.entryDir}`);
+    }
+  }
+  
+  /**
+   * Get the cache path of a full-size frame
+   * @param {string} uniqueId - Telegram file_unique_id of the video
+   * @param {number} position - Position in seconds
+   * @returns {string|null} - Cache path, or null if the id can't be used
+   */
+  getFullFrameCachePath(uniqueId, position) {
+    const entryDir = this.getCacheEntryDir(uniqueId);
+    
+    return entryDir ? path.join(entryDir, `full_${position}.jpg`) : null;
+  }
+  
+  /**
+   * Look up a full-size frame extracted earlier for the same video and position
+   * @param {string} uniqueId - Telegram file_unique_id of the video
+   * @param {number} position - Position in seconds
+   * @returns {Promise<string|null>} - Path to the cached frame, or null on a miss
+   */
+  async getCachedFullFrame(uniqueId, position) {
+    const cachePath = this.getFullFrameCachePath(uniqueId, position);
+    
+    if (cachePath && await fileExists(cachePath)) {
+      logDebug(() => `Using cached full-size thumbnail at ${position}s: ${cachePath}`);
+      return cachePath;
+    }
+    
+    return null;
+  }
+  
+  /**
+   * Extract a single full-size frame, used once the user has picked a preview
+   * @param {string} videoUrl - URL of the video file
+   * @param {number} position - Position in seconds
+   * @param {string} [uniqueId] - Telegram file_unique_id, to cache the frame with the video's previews
+   * @returns {Promise<string|null>} - Path to the frame, or null on failure
+   */
+  async extractFullFrame(videoUrl, position, uniqueId) {
+    const outputPath = path.join(this.tempDir, `${tempName('full')}.jpg`);
+    
+    try {
+      await thumbnailPool.run({
+        source: videoUrl,
+        positions: [position],
+        outputPaths: [outputPath],
+        scaleFilter: FULL_FRAME_SCALE,
+        hwaccel: await this.hwaccel
       });
       
-      ffmpeg.on('error', (err) => {
-        clearTimeout(timeout);
-        reject(err);
+      if (!(await fileExists(outputPath))) return null;
+      
+      logDebug(() => `Extracted full-size thumbnail at ${position}s: ${outputPath}`);
+      
+      // Keep the frame next to the video's cached previews. The rename only
+      // succeeds if that entry exists, and is atomic, so the cache never
+      // holds a partially written frame.
+      const cachePath = this.getFullFrameCachePath(uniqueId, position);
+      
+      if (cachePath) {
+        try {
+          await fs.promises.rename(outputPath, cachePath);
+          return cachePath;
+        } catch (error) {
+          if (error.code !== 'ENOENT') {
+            logError(`Error caching full-size thumbnail at ${position}s:`, error);
+          }
+        }
+      }
+      
+      return outputPath;
+    } catch (error) {
+      logError(`Error extracting full-size thumbnail at ${position}s:`, error);
+      return null;
+    }
+  }
+  
+  /**
+   * Check whether thumbnails can be taken from the head of the video
+   * @param {Object} videoInfo - Video metadata
+   * @returns {boolean} - True if the container is streamable and sizes are known
+   */
+  canUseVideoHead(videoInfo) {
+    return STREAMABLE_MIME_TYPES.includes(videoInfo.mime_type) &&
+      videoInfo.file_size > 0 &&
+      videoInfo.duration > 0;
+  }
+  
+  /**
+   * Extract preview frames in parallel, one ffmpeg process per group of positions
+   * @param {string} source - URL or local path of the video
+   * @param {Object[]} items - Positions in seconds and their output paths
+   * @returns {Promise<void>}
+   */
+  async extractFrames(source, items) {
+    if (items.length === 0) return;
+    
+    // Split the positions into one group per available core; each group is
+    // extracted by a single ffmpeg process and the groups run in parallel
+    const groupCount = Math.min(items.length, CPU_COUNT);
+    const groupSize = Math.ceil(items.length / groupCount);
+    const groups = [];
+    
+    for (let start = 0; start < items.length; start += groupSize) {
+      groups.push(items.slice(start, start + groupSize));
+    }
+    
+    const hwaccel = await this.hwaccel;
+    
+    await Promise.all(groups.map((group) =>
+      thumbnailPool.run({
+        source,
+        positions: group.map((item) => item.position),
+        outputPaths: group.map((item) => item.outputPath),
+        scaleFilter: `scale=-2:${PREVIEW_HEIGHT}`,
+        hwaccel
+      }).catch((error) => {
+        logError('FFmpeg failed to extract some thumbnails:', error);
+        // Keep whichever frames were written before the failure
+      })
+    ));
+  }
+  
+  /**
+   * Combine thumbnails into one side-by-side contact sheet, so the user
+   * gets a single photo to choose from instead of one upload per thumbnail
+   * @param {string[]} thumbnails - Array of thumbnail paths, in display order
+   * @returns {Promise<Buffer|null>} - The contact sheet as JPEG, or null on failure
+   */
+  async createContactSheet(thumbnails) {
+    try {
+      const { image } = await thumbnailPool.run({
+        type: 'contactSheet',
+        inputPaths: thumbnails,
+        tileHeight: PREVIEW_HEIGHT
       });
-    });
+      
+      // Typed arrays lose their Buffer prototype crossing the thread boundary
+      const sheet = Buffer.from(image.buffer, image.byteOffset, image.byteLength);
+      
+      logDebug(() => `Created contact sheet of ${thumbnails.length} thumbnails (${sheet.length} bytes)`);
+      return sheet;
+    } catch (error) {
+      logError('Error creating contact sheet:', error);
+      return null;
+    }
   }
   
   /**
@@ -145,11 +537,11 @@ class ThumbnailGenerator {
       }
       
       // Generate output path
-      const thumbnailPath = path.join(this.tempDir, `manual_${uuidv4()}.jpg`);
+      const thumbnailPath = path.join(this.tempDir, `${tempName('manual')}.jpg`);
       
       // Download the file
       const fileUrl = `https://api.telegram.org/file/bot${botToken}/${fileInfo.file_path}`;
-      await this.downloadFile(fileUrl, thumbnailPath);
+      await downloadFile(fileUrl, thumbnailPath);
       
       logActivity(`Downloaded manual thumbnail: ${thumbnailPath}`);
       return thumbnailPath;
@@ -169,7 +561,7 @@ class ThumbnailGenerator {
     return new Promise((resolve, reject) => {
       const url = `https://api.telegram.org/bot${botToken}/getFile?file_id=${fileId}`;
       
-      https.get(url, (res) => {
+      https.get(url, { agent: httpsAgent }, (res) => {
         let data = '';
         
         res.on('data', (chunk) => {
@@ -195,47 +587,23 @@ class ThumbnailGenerator {
     });
   }
   
-  /**
-   * Download a file from URL
-   * @param {string} url - URL to download
-   * @param {string} outputPath - Where to save the file
-   * @returns {Promise<void>}
-   */
-  async downloadFile(url, outputPath) {
-    return new Promise((resolve, reject) => {
-      const file = fs.createWriteStream(outputPath);
-      
-      https.get(url, (response) => {
-        response.pipe(file);
-        
-        file.on('finish', () => {
-          file.close();
-          resolve();
-        });
-      }).on('error', (err) => {
-        fs.unlink(outputPath, () => {}); // Delete the file on error
-        reject(err);
-      });
-    });
-  }
-  
   /**
    * Clean up generated thumbnails
    * @param {string[]} thumbnails - Array of thumbnail paths
+   * @returns {Promise<void>}
    */
-  cleanupThumbnails(thumbnails) {
+  async cleanupThumbnails(thumbnails) {
     if (!thumbnails || !Array.isArray(thumbnails)) return;
     
-    thumbnails.forEach((thumbnailPath) => {
-      try {
-        if (thumbnailPath && fs.existsSync(thumbnailPath)) {
-          fs.unlinkSync(thumbnailPath);
-          logActivity(`Cleaned up thumbnail: ${thumbnailPath}`);
-        }
-      } catch (error) {
-        logError(`Error cleaning up thumbnail ${thumbnailPath}:`, error);
-      }
-    });
+    const { removed, errors } = await removeFiles(
+      thumbnails.filter((thumbnailPath) => thumbnailPath && !this.isCachedThumbnail(thumbnailPath))
+    );
+    
+    logDebug(() => `Cleaned up ${removed} thumbnails`);
+    
+    if (errors.length > 0) {
+      logError(`Error cleaning up ${errors.length} thumbnails:`, errors[0]);
+    }
   }
 }
 
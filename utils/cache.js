@@ -0,0 +1,92 @@
+/**
+ * In-memory cache with a size cap and per-entry time to live.
+ * Entries are evicted least recently used first once the cap is reached.
+ */
+class TtlCache {
+  /**
+   * Constructor
+   * @param {Object} options - Cache options
+   * @param {number} options.max - Maximum number of entries
+   * @param {number} options.ttl - Time to live of each entry in milliseconds
+   * @param {function(*, *): void} [options.dispose] - Called with (value, key) when an entry expires or is evicted
+   */
+  constructor({ max, ttl, dispose }) {
+    this.max = max;
+    this.ttl = ttl;
+    this.dispose = dispose;
+    this.entries = new Map();
+  }
+  
+  /**
+   * Get a value, refreshing its recency
+   * @param {*} key - Cache key
+   * @returns {*} - Cached value, or undefined if missing or expired
+   */
+  get(key) {
+    const entry = this.entries.get(key);
+    
+    if (!entry) return undefined;
+    
+    if (entry.expiresAt <= Date.now()) {
+      this.evict(key, entry);
+      return undefined;
+    }
+    
+    // Re-insert so the Map's insertion order tracks recency
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+  
+  /**
+   * Store a value
+   * @param {*} key - Cache key
+   * @param {*} value - Value to cache
+   */
+  set(key, value) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttl });
+    
+    // Evict least recently used entries beyond the cap
+    while (this.entries.size > this.max) {
+      const [oldestKey, oldestEntry] = this.entries.entries().next().value;
+      this.evict(oldestKey, oldestEntry);
+    }
+  }
+  
+  /**
+   * Remove a value
+   * @param {*} key - Cache key
+   */
+  delete(key) {
+    this.entries.delete(key);
+  }
+  
+  /**
+   * Remove every expired entry
+   */
+  prune() {
+    const now = Date.now();
+    
+    for (const [key, entry] of this.entries) {
+      if (entry.expiresAt <= now) {
+        this.evict(key, entry);
+      }
+    }
+  }
+  
+  /**
+   * Drop an entry and hand it to the dispose callback
+   * @param {*} key - Cache key
+   * @param {Object} entry - Stored entry
+   */
+  evict(key, entry) {
+    this.entries.delete(key);
+    
+    if (this.dispose) {
+      this.dispose(entry.value, key);
+    }
+  }
+}
+
+module.exports = { TtlCache };
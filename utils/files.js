@@ -0,0 +1,78 @@
+const fs = require('fs');
+
+// Incremented for every temp name so names are unique within this process
+let tempCounter = 0;
+
+/**
+ * Check whether a file exists without blocking the event loop
+ * @param {string} filePath - Path to check
+ * @returns {Promise<boolean>} - True if the file exists
+ */
+function fileExists(filePath) {
+  return fs.promises.access(filePath).then(() => true, () => false);
+}
+
+/**
+ * Delete a file, treating an already missing file as success
+ * @param {string} filePath - Path to delete
+ * @returns {Promise<boolean>} - True if a file was deleted, false if it was missing
+ */
+async function removeFile(filePath) {
+  try {
+    await fs.promises.unlink(filePath);
+    return true;
+  } catch (error) {
+    if (error.code === 'ENOENT') return false;
+    throw error;
+  }
+}
+
+/**
+ * Delete several files concurrently, collecting failures instead of throwing
+ * @param {string[]} filePaths - Paths to delete
+ * @returns {Promise<Object>} - Number of files removed and the errors of those that failed
+ */
+async function removeFiles(filePaths) {
+  const results = await Promise.allSettled(filePaths.map(removeFile));
+  const errors = results.filter((result) => result.status === 'rejected').map((result) => result.reason);
+  const removed = results.filter((result) => result.value === true).length;
+  
+  return { removed, errors };
+}
+
+/**
+ * Give a file a second name. A hard link shares the data, so nothing is
+ * copied and either name can be deleted without affecting the other; a copy
+ * is made only when the paths are on different filesystems.
+ * @param {string} sourcePath - Existing file
+ * @param {string} targetPath - New path for the file
+ * @returns {Promise<void>}
+ */
+async function linkOrCopy(sourcePath, targetPath) {
+  try {
+    await fs.promises.link(sourcePath, targetPath);
+  } catch (error) {
+    if (error.code !== 'EXDEV' && error.code !== 'EPERM') throw error;
+    await fs.promises.copyFile(sourcePath, targetPath);
+  }
+}
+
+/**
+ * Generate a unique name for a temporary file. The process id keeps names
+ * unique across bot instances sharing the temp directory, and the counter
+ * within this process, without the cost of a random UUID.
+ * @param {string} prefix - Prefix describing the file
+ * @returns {string} - Unique file name without extension
+ */
+function tempName(prefix) {
+  return `${prefix}-${process.pid}-${Date.now()}-${tempCounter++}`;
+}
+
+// Export file helpers
+module.exports = {
+  fileExists,
+  removeFile,
+  removeFiles,
+  linkOrCopy,
+  tempName
+};
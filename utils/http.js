@@ -0,0 +1,102 @@
+const fs = require('fs');
+const https = require('https');
+const { pipeline } = require('stream/promises');
+
+// Keep-alive agent shared by the bot and file downloads, so requests to
+// api.telegram.org reuse open TLS connections instead of handshaking each time
+const httpsAgent = new https.Agent({
+  keepAlive: true,
+  maxSockets: 32,
+  maxFreeSockets: 10
+});
+
+// Socket inactivity timeout for file downloads
+const DOWNLOAD_TIMEOUT_MS = 30000;
+
+// Largest file the Bot API serves for download (20MB)
+const MAX_DOWNLOAD_SIZE = 20 * 1024 * 1024;
+
+/**
+ * Start a GET request, aborting it if the socket goes quiet for too long
+ * @param {string} url - URL to request
+ * @param {Object} [headers] - Extra request headers
+ * @returns {Promise<http.IncomingMessage>} - The response, once headers arrive
+ */
+function requestDownload(url, headers) {
+  return new Promise((resolve, reject) => {
+    const request = https.get(url, { agent: httpsAgent, timeout: DOWNLOAD_TIMEOUT_MS, headers }, resolve);
+    
+    request.on('timeout', () => {
+      request.destroy(new Error(`Download timed out after ${DOWNLOAD_TIMEOUT_MS / 1000} seconds`));
+    });
+    request.on('error', reject);
+  });
+}
+
+/**
+ * Write a response body to disk, removing the partial file on failure
+ * @param {http.IncomingMessage} response - Response to save
+ * @param {string} outputPath - Where to save the body
+ * @param {function(http.IncomingMessage): void} checkResponse - Throws if the response should not be saved
+ * @returns {Promise<void>}
+ */
+async function saveResponse(response, outputPath, checkResponse) {
+  try {
+    checkResponse(response);
+    
+    // pipeline handles backpressure and closes both streams on error
+    await pipeline(response, fs.createWriteStream(outputPath));
+  } catch (error) {
+    response.destroy();
+    await fs.promises.unlink(outputPath).catch(() => {}); // Delete the file on error
+    throw error;
+  }
+}
+
+/**
+ * Download a file from URL
+ * @param {string} url - URL to download
+ * @param {string} outputPath - Where to save the file
+ * @returns {Promise<void>}
+ */
+async function downloadFile(url, outputPath) {
+  const response = await requestDownload(url);
+  
+  await saveResponse(response, outputPath, () => {
+    if (response.statusCode !== 200) {
+      throw new Error(`Download failed with status code ${response.statusCode}`);
+    }
+    
+    if (Number(response.headers['content-length']) > MAX_DOWNLOAD_SIZE) {
+      throw new Error(`File is larger than ${MAX_DOWNLOAD_SIZE} bytes`);
+    }
+  });
+}
+
+/**
+ * Download the leading bytes of a file using a range request
+ * @param {string} url - URL to download
+ * @param {string} outputPath - Where to save the bytes
+ * @param {number} byteCount - Number of bytes to fetch from the start
+ * @returns {Promise<void>}
+ */
+async function downloadFileHead(url, outputPath, byteCount) {
+  const response = await requestDownload(url, { Range: `bytes=0-${byteCount - 1}` });
+  
+  await saveResponse(response, outputPath, () => {
+    const contentLength = Number(response.headers['content-length']);
+    const isPartial = response.statusCode === 206;
+    const isSmallFile = response.statusCode === 200 && contentLength <= byteCount;
+    
+    // Never stream the full video if the server ignored the range
+    if (!isPartial && !isSmallFile) {
+      throw new Error(`Range request not honoured (status ${response.statusCode})`);
+    }
+  });
+}
+
+module.exports = {
+  httpsAgent,
+  downloadFile,
+  downloadFileHead
+};
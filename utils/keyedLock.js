@@ -0,0 +1,39 @@
+/**
+ * Serializes tasks that share a key. Tasks for different keys run
+ * concurrently; tasks for the same key run one after another, in the order
+ * they were submitted.
+ */
+class KeyedLock {
+  /**
+   * Constructor
+   */
+  constructor() {
+    this.tails = new Map();
+  }
+  
+  /**
+   * Run a task once every earlier task with the same key has settled
+   * @param {*} key - Lock key
+   * @param {function(): Promise<*>} task - Task to run
+   * @returns {Promise<*>} - Result of the task
+   */
+  run(key, task) {
+    const previous = this.tails.get(key) || Promise.resolve();
+    const result = previous.then(() => task());
+    
+    // The next task waits for this one whether it succeeds or fails
+    const tail = result.catch(() => {});
+    this.tails.set(key, tail);
+    
+    // Drop the key once nothing else has queued behind this task
+    tail.then(() => {
+      if (this.tails.get(key) === tail) {
+        this.tails.delete(key);
+      }
+    });
+    
+    return result;
+  }
+}
+
+module.exports = { KeyedLock };
@@ -10,6 +10,31 @@ if (!fs.existsSync(logDir)) {
 const activityLogPath = path.join(logDir, 'activity.log');
 const errorLogPath = path.join(logDir, 'error.log');
 
+/**
+ * Open a log file for appending, kept open for the life of the process
+ * @param {string} filePath - Log file path
+ * @param {string} name - Log name used in error messages
+ * @returns {fs.WriteStream} - Append stream
+ */
+function openLogStream(filePath, name) {
+  const stream = fs.createWriteStream(filePath, { flags: 'a' });
+  
+  stream.on('error', (err) => {
+    console.error(`Failed to write to ${name} log:`, err);
+  });
+  
+  return stream;
+}
+
+// One stream per file, so a log line is a buffered write rather than an
+// open/append/close of the file
+const activityLog = openLogStream(activityLogPath, 'activity');
+const errorLog = openLogStream(errorLogPath, 'error');
+
+// Per-step detail (individual frames, cache hits, file deletions) is only
+// logged when LOG_LEVEL=debug
+const DEBUG_ENABLED = process.env.LOG_LEVEL === 'debug';
+
 /**
  * Log activity to file and console
  * @param {string} message - Activity message to log
@@ -21,11 +46,17 @@ function logActivity(message) {
   console.log(`[ACTIVITY] ${message}`);
   
   // Write to log file
-  fs.appendFile(activityLogPath, logEntry, (err) => {
-    if (err) {
-      console.error('Failed to write to activity log:', err);
-    }
-  });
+  activityLog.write(logEntry);
+}
+
+/**
+ * Log detailed activity, only when debug logging is enabled
+ * @param {function(): string} buildMessage - Builds the message; not called when disabled
+ */
+function logDebug(buildMessage) {
+  if (!DEBUG_ENABLED) return;
+  
+  logActivity(`[DEBUG] ${buildMessage()}`);
 }
 
 /**
@@ -46,15 +77,12 @@ function logError(message, error) {
   }
   
   // Write to log file
-  fs.appendFile(errorLogPath, logEntry, (err) => {
-    if (err) {
-      console.error('Failed to write to error log:', err);
-    }
-  });
+  errorLog.write(logEntry);
 }
 
 // Export logger functions
 module.exports = {
   logActivity,
+  logDebug,
   logError
 };
@@ -0,0 +1,68 @@
+/**
+ * Token bucket rate limiter. Up to `capacity` tasks start immediately, after
+ * which tasks are started as tokens refill, in the order they were scheduled.
+ */
+class TokenBucket {
+  /**
+   * Constructor
+   * @param {Object} options - Limiter options
+   * @param {number} options.capacity - Maximum number of tokens (burst size)
+   * @param {number} options.interval - Time in milliseconds to refill the whole bucket
+   */
+  constructor({ capacity, interval }) {
+    this.capacity = capacity;
+    this.interval = interval;
+    this.tokens = capacity;
+    this.lastRefill = Date.now();
+    this.queue = [];
+    this.timer = null;
+  }
+  
+  /**
+   * Run a task once a token is available
+   * @param {function(): Promise<*>} task - Task to run
+   * @returns {Promise<*>} - Result of the task
+   */
+  schedule(task) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ task, resolve, reject });
+      this.drain();
+    });
+  }
+  
+  /**
+   * Add the tokens earned since the last refill
+   */
+  refill() {
+    const now = Date.now();
+    const earned = ((now - this.lastRefill) / this.interval) * this.capacity;
+    
+    this.tokens = Math.min(this.capacity, this.tokens + earned);
+    this.lastRefill = now;
+  }
+  
+  /**
+   * Start as many queued tasks as there are tokens, then wait for the next one
+   */
+  drain() {
+    this.refill();
+    
+    while (this.queue.length > 0 && this.tokens >= 1) {
+      const { task, resolve, reject } = this.queue.shift();
+      this.tokens -= 1;
+      
+      Promise.resolve().then(task).then(resolve, reject);
+    }
+    
+    if (this.queue.length > 0 && !this.timer) {
+      const wait = Math.ceil(((1 - this.tokens) * this.interval) / this.capacity);
+      
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.drain();
+      }, wait);
+    }
+  }
+}
+
+module.exports = { TokenBucket };
@@ -0,0 +1,113 @@
+const { Worker } = require('worker_threads');
+const { logError } = require('./logger');
+
+/**
+ * Fixed-size pool of worker threads running the same script.
+ * Each worker handles one job at a time; extra jobs wait in a queue.
+ */
+class WorkerPool {
+  /**
+   * Constructor
+   * @param {string} workerFile - Absolute path of the worker script
+   * @param {number} size - Maximum number of workers
+   */
+  constructor(workerFile, size) {
+    this.workerFile = workerFile;
+    this.size = size;
+    this.workers = new Set();
+    this.idle = [];
+    this.queue = [];
+    this.activeJobs = new Map();
+  }
+  
+  /**
+   * Run a job on the next free worker
+   * @param {Object} data - Message posted to the worker
+   * @returns {Promise<Object>} - Message the worker replied with
+   */
+  run(data) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ data, resolve, reject });
+      this.dispatch();
+    });
+  }
+  
+  /**
+   * Hand queued jobs to idle workers, starting new ones up to the pool size
+   */
+  dispatch() {
+    while (this.queue.length > 0) {
+      let worker = this.idle.pop();
+      
+      if (!worker) {
+        if (this.workers.size >= this.size) return;
+        worker = this.createWorker();
+      }
+      
+      const job = this.queue.shift();
+      this.activeJobs.set(worker, job);
+      worker.ref();
+      worker.postMessage(job.data);
+    }
+  }
+  
+  /**
+   * Start a worker and wire up its result and failure handling.
+   * Workers are only ref'd while running a job so idle ones never keep the
+   * process alive on shutdown.
+   * @returns {Worker} - The new worker
+   */
+  createWorker() {
+    const worker = new Worker(this.workerFile);
+    
+    worker.on('message', (result) => {
+      const job = this.activeJobs.get(worker);
+      this.activeJobs.delete(worker);
+      
+      if (result.error) {
+        job.reject(new Error(result.error));
+      } else {
+        job.resolve(result);
+      }
+      
+      worker.unref();
+      this.idle.push(worker);
+      this.dispatch();
+    });
+    
+    worker.on('error', (error) => {
+      logError('Worker thread failed:', error);
+      this.removeWorker(worker, error);
+    });
+    
+    worker.on('exit', (code) => {
+      this.removeWorker(worker, new Error(`Worker thread exited with code ${code}`));
+    });
+    
+    this.workers.add(worker);
+    return worker;
+  }
+  
+  /**
+   * Drop a dead worker, failing its job and replacing it if work is queued
+   * @param {Worker} worker - The worker that stopped
+   * @param {Error} error - Why it stopped
+   */
+  removeWorker(worker, error) {
+    if (!this.workers.has(worker)) return;
+    
+    this.workers.delete(worker);
+    this.idle = this.idle.filter((idleWorker) => idleWorker !== worker);
+    
+    const job = this.activeJobs.get(worker);
+    
+    if (job) {
+      this.activeJobs.delete(worker);
+      job.reject(error);
+    }
+    
+    this.dispatch();
+  }
+}
+
+module.exports = { WorkerPool };
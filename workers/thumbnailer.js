@@ -0,0 +1,203 @@
+const { parentPort } = require('worker_threads');
+const { spawn } = require('child_process');
+const path = require('path');
+
+// Worker thread that runs ffmpeg frame extraction and contact sheet jobs
+// posted by the ThumbnailGenerator pool, keeping process management and
+// stderr handling off the bot's main thread
+
+/**
+ * Get the ffmpeg encoder options for an output image
+ * @param {string} outputPath - Output file, whose extension picks the format
+ * @returns {string[]} - Encoder arguments
+ */
+function encoderArgs(outputPath) {
+  // WebP previews are roughly a third smaller than JPEG at similar quality,
+  // which cuts disk writes and the upload back to Telegram
+  if (path.extname(outputPath) === '.webp') {
+    return ['-c:v', 'libwebp', '-quality', '80', '-preset', 'picture'];
+  }
+  
+  // JPEG (chosen thumbnails) at roughly quality 75; Telegram recompresses
+  // photos anyway, so higher settings only make the upload bigger
+  return ['-q:v', '4'];
+}
+
+/**
+ * Extract several frames from a video in one ffmpeg process
+ * @param {string} videoUrl - URL of the video
+ * @param {number[]} positions - Positions in seconds
+ * @param {string[]} outputPaths - Where to save each extracted frame
+ * @param {Object} [options] - Extraction options
+ * @param {string} [options.scaleFilter] - Scale filter applied to each frame, full size if omitted
+ * @param {string} [options.hwaccel] - Hardware decoder to use, software decoding if omitted
+ * @returns {Promise<string[]>} - Paths of the extracted frames
+ */
+function extractFramesWithFfmpeg(videoUrl, positions, outputPaths, { scaleFilter, hwaccel } = {}) {
+  return new Promise((resolve, reject) => {
+    const timeoutMs = 30000 * positions.length;
+    
+    // Set timeout to prevent hanging
+    const timeout = setTimeout(() => {
+      ffmpeg.kill('SIGKILL');
+      reject(new Error(`FFmpeg process timed out after ${timeoutMs / 1000} seconds`));
+    }, timeoutMs);
+    
+    // Open the video once per position, each with its own input seek.
+    // Seeking before -i with -noaccurate_seek jumps straight to the nearest
+    // keyframe instead of decoding forward from it, and -skip_frame nokey
+    // stops the decoder from touching any non-keyframe packets. Decoding
+    // is kept to a single thread because parallelism comes from running
+    // several processes at once.
+    const args = ['-hide_banner', '-loglevel', 'error'];
+    
+    // Frames decoded on the GPU are copied back to system memory for the
+    // filters and encoder. The device was checked to work when the decoder
+    // was picked; ffmpeg falls back to software decoding by itself for
+    // codecs the hardware doesn't support.
+    const hwaccelArgs = hwaccel ? ['-hwaccel', hwaccel] : [];
+    
+    positions.forEach((position) => {
+      args.push(
+        ...hwaccelArgs,
+        '-ss', String(position),
+        '-noaccurate_seek',
+        '-skip_frame', 'nokey',
+        '-threads', '1',
+        '-i', videoUrl
+      );
+    });
+    
+    // Smaller frames are cheaper to encode and upload
+    const scaleArgs = scaleFilter ? ['-vf', scaleFilter] : [];
+    
+    // Map the video stream of each input to its own single-frame output
+    outputPaths.forEach((outputPath, i) => {
+      args.push(
+        '-map', `${i}:v:0`,
+        '-an',
+        '-sn',
+        '-dn',
+        '-frames:v', '1',
+        ...scaleArgs,
+        ...encoderArgs(outputPath),
+        '-y',
+        outputPath
+      );
+    });
+    
+    // Run FFmpeg to extract the frames
+    const ffmpeg = spawn('ffmpeg', args, { stdio: ['ignore', 'ignore', 'pipe'] });
+    
+    let stderrData = '';
+    
+    ffmpeg.stderr.on('data', (data) => {
+      stderrData += data.toString();
+    });
+    
+    ffmpeg.on('close', (code) => {
+      clearTimeout(timeout);
+      
+      // Callers check which outputs were actually written
+      if (code === 0) {
+        resolve(outputPaths);
+      } else {
+        const error = new Error(`FFmpeg process failed with code ${code}: ${stderrData}`);
+        reject(error);
+      }
+    });
+    
+    ffmpeg.on('error', (err) => {
+      clearTimeout(timeout);
+      reject(err);
+    });
+  });
+}
+
+/**
+ * Stack several images side by side into a single contact sheet
+ * @param {string[]} inputPaths - Images to place on the sheet, left to right
+ * @param {number} tileHeight - Height every image is scaled to
+ * @returns {Promise<Buffer>} - The contact sheet as JPEG
+ */
+function createContactSheetWithFfmpeg(inputPaths, tileHeight) {
+  return new Promise((resolve, reject) => {
+    const timeoutMs = 30000;
+    
+    // Set timeout to prevent hanging
+    const timeout = setTimeout(() => {
+      ffmpeg.kill('SIGKILL');
+      reject(new Error(`FFmpeg process timed out after ${timeoutMs / 1000} seconds`));
+    }, timeoutMs);
+    
+    const args = ['-hide_banner', '-loglevel', 'error'];
+    
+    inputPaths.forEach((inputPath) => {
+      args.push('-i', inputPath);
+    });
+    
+    // Inputs can differ in size (e.g. Telegram's own thumbnail), so each is
+    // scaled to a common height before they are stacked horizontally
+    const scaled = inputPaths.map((inputPath, i) => `[${i}:v]scale=-2:${tileHeight},setsar=1[t${i}]`);
+    const labels = inputPaths.map((inputPath, i) => `[t${i}]`).join('');
+    const filter = `${scaled.join(';')};${labels}hstack=inputs=${inputPaths.length}[sheet]`;
+    
+    // The sheet is uploaded once and never reused, so it is written to
+    // stdout and kept in memory rather than going through a temp file
+    args.push(
+      '-filter_complex', filter,
+      '-map', '[sheet]',
+      '-frames:v', '1',
+      '-c:v', 'mjpeg',
+      '-q:v', '3',
+      '-f', 'image2pipe',
+      'pipe:1'
+    );
+    
+    const ffmpeg = spawn('ffmpeg', args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    
+    const chunks = [];
+    let stderrData = '';
+    
+    ffmpeg.stdout.on('data', (chunk) => {
+      chunks.push(chunk);
+    });
+    
+    ffmpeg.stderr.on('data', (data) => {
+      stderrData += data.toString();
+    });
+    
+    ffmpeg.on('close', (code) => {
+      clearTimeout(timeout);
+      
+      if (code === 0) {
+        resolve(Buffer.concat(chunks));
+      } else {
+        reject(new Error(`FFmpeg process failed with code ${code}: ${stderrData}`));
+      }
+    });
+    
+    ffmpeg.on('error', (err) => {
+      clearTimeout(timeout);
+      reject(err);
+    });
+  });
+}
+
+// Run one job at a time and report back when it finishes
+parentPort.on('message', async (job) => {
+  try {
+    if (job.type === 'contactSheet') {
+      const image = await createContactSheetWithFfmpeg(job.inputPaths, job.tileHeight);
+      parentPort.postMessage({ image });
+    } else {
+      await extractFramesWithFfmpeg(job.source, job.positions, job.outputPaths, {
+        scaleFilter: job.scaleFilter,
+        hwaccel: job.hwaccel
+      });
+      parentPort.postMessage({ outputPaths: job.outputPaths });
+    }
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});